@@ -1,7 +1,5 @@
 import logging
-from fastapi import APIRouter, Header, Query, HTTPException
-
-from app.feed.service import FeedSearchService
+from fastapi import APIRouter, Header, Query, HTTPException, Request
 
 
 logger = logging.getLogger(__name__)
@@ -11,6 +9,7 @@ router = APIRouter(prefix="/feeds", tags=["feeds"])
 
 @router.get("")
 async def get_feeds(
+    request: Request,
     user_id: str = Header(..., alias="user-id"),
     days: int = Query(default=7, ge=1, le=30, description="Number of days to look back"),
     size: int = Query(default=10, ge=1, le=100, description="Number of results to return")
@@ -18,31 +17,28 @@ async def get_feeds(
     try:
         logger.info(f"Getting feeds for user {user_id}, days={days}, top_k={size}")
         
-        feed_service = FeedSearchService()
-        
-        try:
-            result = await feed_service.search_feeds(
-                user_id=user_id,
-                days=days,
-                top_k=size
+        # Shared across requests so clients and the query cache are reused
+        feed_service = request.app.state.ctx.feed_search_service
+
+        result = await feed_service.search_feeds(
+            user_id=user_id,
+            days=days,
+            top_k=size
+        )
+
+        if result is None:
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to search feeds"
             )
 
-            if result is None:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Failed to search feeds"
-                )
-
-            search_results = result.get("search_results", {})
-            matches = search_results.get("matches", [])
-
-            return {
-                "message": "successfully get feeds",
-                "data": matches
-            }
-            
-        finally:
-            await feed_service.close()
+        search_results = result.get("search_results", {})
+        matches = search_results.get("matches", [])
+
+        return {
+            "message": "successfully get feeds",
+            "data": matches
+        }
         
     except HTTPException:
         raise
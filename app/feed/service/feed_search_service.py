@@ -102,7 +102,7 @@ class FeedSearchService:
 
             logger.info(f"Searching for top {top_k} similar memorials")
             try:
-                search_results = self.vector_store.query(
+                search_results = await self.vector_store.query(
                     vector=avg_embedding,
                     top_k=top_k,
                     include_metadata=True,
@@ -181,4 +181,5 @@ class FeedSearchService:
 
     async def close(self):
         await self.memorial_client.close()
+        await self.vector_store.close()
         logger.info("Feed Search Service closed")
@@ -13,6 +13,7 @@ from dotenv import load_dotenv
 from core.util import vector_id_generator
 from core.vectorstores import PineconeVectorStore
 from core.publisher import AvroKafkaPublisher
+from core.serializer import SchemaRegistryClient
 from core.exceptions import (
     VectorStoreException,
     MemorialDataException,
@@ -30,11 +31,20 @@ class MemorialVectorDeleteService:
         self.vectorstore = PineconeVectorStore()
         self.publisher: Optional[AvroKafkaPublisher] = None
 
-    async def initialize_publisher(self) -> None:
-        """Initialize the Kafka publisher for response events."""
+    async def initialize_publisher(
+        self,
+        schema_registry_client: Optional[SchemaRegistryClient] = None
+    ) -> None:
+        """
+        Initialize the Kafka publisher for response events.
+
+        Args:
+            schema_registry_client: Shared Schema Registry client to reuse
+        """
         if self.publisher is None:
             self.publisher = AvroKafkaPublisher(
-                client_id="memorial-vector-delete-response-publisher"
+                client_id="memorial-vector-delete-response-publisher",
+                schema_registry_client=schema_registry_client
             )
             await self.publisher.start()
             logger.info("Memorial Vector Delete publisher initialized")
@@ -46,6 +56,12 @@ class MemorialVectorDeleteService:
             self.publisher = None
             logger.info("Memorial Vector Delete publisher closed")
 
+    async def close(self) -> None:
+        """Close the publisher and the vector store client."""
+        await self.close_publisher()
+        await self.vectorstore.close()
+        logger.info("Memorial Vector Delete Service closed")
+
     async def delete_memorial(self, memorial_data: dict) -> bool:
         """
         Delete memorial vector and publish response event.
@@ -71,7 +87,7 @@ class MemorialVectorDeleteService:
 
             # Delete from Pinecone
             try:
-                self.vectorstore.delete(vector_id)
+                await self.vectorstore.delete(vector_id)
                 logger.info(f"Deleted memorial vector: memorialId={memorial_id}, vectorId={vector_id}")
             except Exception as e:
                 raise VectorStoreException("delete", str(e))
@@ -20,6 +20,7 @@ from core.util import vector_id_generator
 from core.vectorstores import PineconeVectorStore
 from core.clients import CharacterAPIClient
 from core.publisher import AvroKafkaPublisher
+from core.serializer import SchemaRegistryClient
 from core.exceptions import (
     CharacterFetchException,
     VectorStoreException,
@@ -42,11 +43,20 @@ class MemorialVectorStoreService:
         )
         self.publisher: Optional[AvroKafkaPublisher] = None
 
-    async def initialize_publisher(self) -> None:
-        """Initialize the Kafka publisher for response events."""
+    async def initialize_publisher(
+        self,
+        schema_registry_client: Optional[SchemaRegistryClient] = None
+    ) -> None:
+        """
+        Initialize the Kafka publisher for response events.
+
+        Args:
+            schema_registry_client: Shared Schema Registry client to reuse
+        """
         if self.publisher is None:
             self.publisher = AvroKafkaPublisher(
-                client_id="memorial-vector-store-response-publisher"
+                client_id="memorial-vector-store-response-publisher",
+                schema_registry_client=schema_registry_client
             )
             await self.publisher.start()
             logger.info("Memorial Vector Store publisher initialized")
@@ -58,6 +68,13 @@ class MemorialVectorStoreService:
             self.publisher = None
             logger.info("Memorial Vector Store publisher closed")
 
+    async def close(self) -> None:
+        """Close the publisher and the vector store client."""
+        await self.close_publisher()
+        await self.vectorstore.close()
+        await self.character_client.close()
+        logger.info("Memorial Vector Store Service closed")
+
     async def process_memorial(self, memorial_data: dict) -> bool:
         """
         Process memorial vectorizing request.
@@ -108,7 +125,7 @@ class MemorialVectorStoreService:
             )
 
             # 5. Pinecone에 저장
-            self._store_vector(memorial_id, embedding, metadata)
+            await self._store_vector(memorial_id, embedding, metadata)
 
             # 6. memorial-vectorizing-response 이벤트 발행
             await self._publish_response(
@@ -138,7 +155,7 @@ class MemorialVectorStoreService:
         """
         try:
             vector_id = vector_id_generator.create_vector_id(memorial_id)
-            result = self.vectorstore.fetch(vector_id)
+            result = await self.vectorstore.fetch(vector_id)
             
             # Check if the vector exists in the response
             vectors = result.get("vectors", {})
@@ -242,7 +259,7 @@ class MemorialVectorStoreService:
 
         return metadata
 
-    def _store_vector(
+    async def _store_vector(
         self,
         memorial_id: int,
         embedding: list[float],
@@ -262,7 +279,7 @@ class MemorialVectorStoreService:
         try:
             vector_id = vector_id_generator.create_vector_id(memorial_id)
 
-            self.vectorstore.upsert(
+            await self.vectorstore.upsert(
                 id=vector_id,
                 embedding=embedding,
                 metadata=metadata
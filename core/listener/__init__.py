@@ -5,5 +5,17 @@ Kafka listener module for consuming and processing Kafka messages.
 from .kafka_listener import KafkaListener
 from .memorial_vector_listener import MemorialVectorListener
 from .memorial_delete_listener import MemorialDeleteListener
+from .unified_memorial_listener import (
+    UnifiedMemorialListener,
+    MEMORIAL_VECTORIZING_TOPIC,
+    MEMORIAL_VECTOR_DELETE_TOPIC,
+)
 
-__all__ = ["KafkaListener", "MemorialVectorListener", "MemorialDeleteListener"]
\ No newline at end of file
+__all__ = [
+    "KafkaListener",
+    "MemorialVectorListener",
+    "MemorialDeleteListener",
+    "UnifiedMemorialListener",
+    "MEMORIAL_VECTORIZING_TOPIC",
+    "MEMORIAL_VECTOR_DELETE_TOPIC",
+]
\ No newline at end of file
@@ -1,43 +1,124 @@
 
-import json
+import asyncio
 import logging
+import os
 from abc import ABC
-from typing import Optional, Callable, Awaitable
-from aiokafka import AIOKafkaConsumer
-from aiokafka.errors import KafkaError
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Callable, Awaitable
+import orjson
+from aiokafka import (
+    AIOKafkaConsumer,
+    AIOKafkaProducer,
+    ConsumerRebalanceListener,
+    ConsumerRecord,
+    OffsetAndMetadata,
+    TopicPartition,
+)
+from aiokafka.admin import AIOKafkaAdminClient
+from aiokafka.errors import CommitFailedError, KafkaError
 
 from core.serializer import AvroDeserializer, SchemaRegistryClient
 
 
 logger = logging.getLogger(__name__)
 
+# Log one "Received message" line per this many offsets
+LOG_SAMPLE_EVERY = 1000
+
+# Consumer options the admin client needs to reach the same cluster
+_ADMIN_CONFIG_KEYS = (
+    "security_protocol",
+    "ssl_context",
+    "sasl_mechanism",
+    "sasl_plain_username",
+    "sasl_plain_password",
+    "sasl_kerberos_service_name",
+    "sasl_kerberos_domain_name",
+    "sasl_oauth_token_provider",
+)
+
+
+class _OffsetSeeder(ConsumerRebalanceListener):
+    """Seeds newly assigned partitions from another group's offsets."""
+
+    def __init__(self, listener: "KafkaListener"):
+        self._listener = listener
+
+    async def on_partitions_revoked(self, revoked) -> None:
+        pass
+
+    async def on_partitions_assigned(self, assigned) -> None:
+        await self._listener._seed_offsets(assigned)
+
 
 class KafkaListener(ABC):
     def __init__(
         self,
-        topic: str,
+        topic: str | list[str],
         bootstrap_servers: str | list[str],
         schema_registry_url: str,
         group_id: str = "feed",
         auto_offset_reset: str = "earliest",
         enable_auto_commit: bool = True,
         schema_registry_auth: Optional[tuple[str, str]] = None,
+        fetch_min_bytes: Optional[int] = None,
+        fetch_max_wait_ms: Optional[int] = None,
+        max_partition_fetch_bytes: Optional[int] = None,
+        batch_size: int = 500,
+        poll_timeout_ms: int = 200,
+        handler_concurrency: Optional[int] = None,
+        decode_workers: int = 4,
+        schema_registry_client: Optional[SchemaRegistryClient] = None,
+        dlq_topic: Optional[str] = None,
+        offset_seed_groups: Optional[dict[str, str]] = None,
         **kwargs
     ):
         self.topic = topic
+        self.topics = [topic] if isinstance(topic, str) else list(topic)
         self.bootstrap_servers = bootstrap_servers
         self.schema_registry_url = schema_registry_url
         self.group_id = group_id
         self.auto_offset_reset = auto_offset_reset
         self.enable_auto_commit = enable_auto_commit
         self.schema_registry_auth = schema_registry_auth
+        # Let the broker accumulate records per fetch instead of answering
+        # every poll with a single small Avro message
+        self.fetch_min_bytes = fetch_min_bytes or int(
+            os.getenv("KAFKA_FETCH_MIN_BYTES", 64 * 1024)
+        )
+        self.fetch_max_wait_ms = fetch_max_wait_ms or int(
+            os.getenv("KAFKA_FETCH_MAX_WAIT_MS", 200)
+        )
+        self.max_partition_fetch_bytes = max_partition_fetch_bytes or int(
+            os.getenv("KAFKA_MAX_PARTITION_FETCH_BYTES", 4 * 1024 * 1024)
+        )
+        self.batch_size = batch_size
+        self.poll_timeout_ms = poll_timeout_ms
+        # In-flight handler bound. A batch is fully handled before the next
+        # one is taken, so at most two batches (one prefetched) are resident
+        self.handler_concurrency = handler_concurrency or int(
+            os.getenv("HANDLER_CONCURRENCY", 32)
+        )
+        self.decode_workers = decode_workers
+        # Records whose decode or handler failed are forwarded here
+        self.dlq_topic = dlq_topic
+        # topic -> group that consumed it before; partitions this group has
+        # never committed start where that group left off, not at the reset
+        # policy, so moving a topic between groups doesn't replay it
+        self.offset_seed_groups = offset_seed_groups or {}
         self.additional_config = kwargs
 
         self._consumer: Optional[AIOKafkaConsumer] = None
-        self._schema_registry: Optional[SchemaRegistryClient] = None
+        # A client passed in is shared with other components and not closed here
+        self._schema_registry: Optional[SchemaRegistryClient] = schema_registry_client
+        self._owns_schema_registry = schema_registry_client is None
         self._deserializer: Optional[AvroDeserializer] = None
+        self._decode_pool: Optional[ThreadPoolExecutor] = None
+        self._dlq_producer: Optional[AIOKafkaProducer] = None
         self._started = False
         self._message_handler: Optional[Callable[[dict], Awaitable[None]]] = None
+        self._topic_handlers: dict[str, Callable[[dict], Awaitable[None]]] = {}
+        self._handler_semaphore = asyncio.Semaphore(self.handler_concurrency)
 
     async def start(self) -> None:
         if self._started:
@@ -45,30 +126,59 @@ class KafkaListener(ABC):
             return
 
         try:
-            self._schema_registry = SchemaRegistryClient(
-                url=self.schema_registry_url,
-                auth=self.schema_registry_auth
-            )
+            if self._schema_registry is None:
+                self._schema_registry = SchemaRegistryClient(
+                    url=self.schema_registry_url,
+                    auth=self.schema_registry_auth
+                )
 
             self._deserializer = AvroDeserializer(
                 schema_registry_client=self._schema_registry
             )
+            self._decode_pool = ThreadPoolExecutor(
+                max_workers=self.decode_workers,
+                thread_name_prefix=f"{self.__class__.__name__}-decode"
+            )
 
             self._consumer = AIOKafkaConsumer(
-                self.topic,
                 bootstrap_servers=self.bootstrap_servers,
                 group_id=self.group_id,
                 auto_offset_reset=self.auto_offset_reset,
                 enable_auto_commit=self.enable_auto_commit,
-                key_deserializer=lambda k: k.decode('utf-8') if k else None,
+                fetch_min_bytes=self.fetch_min_bytes,
+                fetch_max_wait_ms=self.fetch_max_wait_ms,
+                max_partition_fetch_bytes=self.max_partition_fetch_bytes,
                 **self.additional_config
             )
+            self._consumer.subscribe(
+                self.topics,
+                listener=_OffsetSeeder(self) if self.offset_seed_groups else None
+            )
 
             await self._consumer.start()
+
+            if self.dlq_topic:
+                self._dlq_producer = AIOKafkaProducer(
+                    bootstrap_servers=self.bootstrap_servers,
+                    client_id=f"{self.group_id}-dlq",
+                    acks="all",
+                    linger_ms=5
+                )
+                try:
+                    await self._dlq_producer.start()
+                except Exception:
+                    # close() only stops a started consumer; leaving this one
+                    # joined would hold its partitions until the session times out
+                    self._dlq_producer = None
+                    await self._consumer.stop()
+                    raise
+
             self._started = True
 
+            await self._prefetch_schemas()
+
             logger.info(
-                f"{self.__class__.__name__} started: topic='{self.topic}', "
+                f"{self.__class__.__name__} started: topic='{', '.join(self.topics)}', "
                 f"group_id='{self.group_id}', brokers={self.bootstrap_servers}"
             )
 
@@ -76,12 +186,79 @@ class KafkaListener(ABC):
             logger.error(f"Failed to start {self.__class__.__name__}: {e}")
             raise
 
+    async def _seed_offsets(self, assigned: set[TopicPartition]) -> None:
+        """Seek partitions without a committed offset to their seed group's."""
+        unseeded: dict[str, list[TopicPartition]] = {}
+        for tp in assigned:
+            seed_group = self.offset_seed_groups.get(tp.topic)
+            if seed_group and await self._consumer.committed(tp) is None:
+                unseeded.setdefault(seed_group, []).append(tp)
+
+        for seed_group, partitions in unseeded.items():
+            admin = AIOKafkaAdminClient(
+                bootstrap_servers=self.bootstrap_servers,
+                **{
+                    key: value for key, value in self.additional_config.items()
+                    if key in _ADMIN_CONFIG_KEYS
+                }
+            )
+            try:
+                await admin.start()
+                offsets = await admin.list_consumer_group_offsets(
+                    seed_group, partitions=partitions
+                )
+            except Exception as e:
+                # Replaying from the reset policy could redo the topic's whole
+                # history; starting at the end only skips what arrived meanwhile
+                logger.error(
+                    "Could not read offsets of group '%s': %s. Starting %s at the end",
+                    seed_group, e, partitions
+                )
+                await self._consumer.seek_to_end(*partitions)
+                continue
+            finally:
+                await admin.close()
+
+            for tp in partitions:
+                seed = offsets.get(tp)
+                if seed is not None and seed.offset >= 0:
+                    self._consumer.seek(tp, seed.offset)
+                    logger.info(
+                        "Seeded %s from group '%s' at offset %s",
+                        tp, seed_group, seed.offset
+                    )
+
+    async def _prefetch_schemas(self) -> None:
+        """Resolve each topic's latest value schema before the first poll."""
+        subjects = [f"{topic}-value" for topic in self.topics]
+        results = await asyncio.gather(
+            *(self._deserializer.prefetch_subject(subject) for subject in subjects),
+            return_exceptions=True
+        )
+        for subject, result in zip(subjects, results):
+            if isinstance(result, BaseException):
+                # Not fatal; the schema is fetched by ID on the first message
+                logger.warning("Could not prefetch schema for '%s': %s", subject, result)
+            else:
+                logger.info("Prefetched schema %s for '%s'", result, subject)
+
     def set_message_handler(
         self,
-        handler: Callable[[dict], Awaitable[None]]
+        handler: Callable[[dict], Awaitable[None]],
+        topic: Optional[str] = None
     ) -> None:
-        """Register a message handler callback."""
-        self._message_handler = handler
+        """
+        Register a message handler callback.
+
+        Args:
+            handler: Coroutine function called with each deserialized message
+            topic: Only handle messages from this topic; the handler without
+                a topic serves every topic that has no handler of its own
+        """
+        if topic is None:
+            self._message_handler = handler
+        else:
+            self._topic_handlers[topic] = handler
         logger.info(f"{self.__class__.__name__}: Message handler registered")
 
     async def consume(self) -> None:
@@ -89,44 +266,32 @@ class KafkaListener(ABC):
         if not self._started:
             await self.start()
 
-        if self._message_handler is None:
+        if self._message_handler is None and not self._topic_handlers:
             logger.warning(
                 f"{self.__class__.__name__}: No message handler set. "
                 "Messages will be logged only."
             )
 
-        logger.info(f"Starting to consume messages from topic '{self.topic}'")
+        logger.info(f"Starting to consume messages from topic '{', '.join(self.topics)}'")
 
+        next_fetch: Optional[asyncio.Task] = None
         try:
-            async for message in self._consumer:
-                try:
-                    deserialized_data = await self._deserializer.deserialize(
-                        message.value,
-                        message.key
-                    )
-
-                    logger.info(
-                        f"Received message - Topic: {message.topic}, "
-                        f"Partition: {message.partition}, Offset: {message.offset}, "
-                        f"Key: {message.key}"
-                    )
-                    logger.debug(f"Deserialized data: {deserialized_data}")
-
-                    if self._message_handler:
-                        await self._message_handler(deserialized_data)
-                    else:
-                        logger.info(
-                            f"{self.__class__.__name__} data: "
-                            f"{json.dumps(deserialized_data, indent=2)}"
-                        )
-
-                except Exception as e:
-                    logger.error(
-                        f"Error processing message from partition {message.partition}, "
-                        f"offset {message.offset}: {e}",
-                        exc_info=True
-                    )
-                    continue
+            next_fetch = asyncio.create_task(self._fetch())
+            while True:
+                records = await next_fetch
+                # Fetch the next batch while this one is being processed
+                next_fetch = asyncio.create_task(self._fetch())
+                # Partitions run in parallel, each in offset order
+                results = await asyncio.gather(*(
+                    self._process_partition(tp, messages)
+                    for tp, messages in records.items()
+                ))
+                failures = [failure for failed in results for failure in failed]
+                if failures:
+                    # Before the commit, so an unsent dead letter is redelivered
+                    await self._publish_dead_letters(failures)
+                if records and not self.enable_auto_commit:
+                    await self._commit(records)
 
         except KafkaError as e:
             logger.error(f"Kafka error while consuming: {e}")
@@ -134,6 +299,153 @@ class KafkaListener(ABC):
         except Exception as e:
             logger.error(f"Unexpected error while consuming: {e}")
             raise
+        finally:
+            if next_fetch is not None and not next_fetch.done():
+                next_fetch.cancel()
+
+    async def _fetch(self) -> dict:
+        return await self._consumer.getmany(
+            timeout_ms=self.poll_timeout_ms,
+            max_records=self.batch_size
+        )
+
+    async def _commit(self, records: dict[TopicPartition, list[ConsumerRecord]]) -> None:
+        """Commit past the last record of each partition in a processed batch."""
+        offsets = {
+            tp: OffsetAndMetadata(messages[-1].offset + 1, "")
+            for tp, messages in records.items()
+            if messages
+        }
+        try:
+            await self._consumer.commit(offsets)
+        except CommitFailedError as e:
+            # Partitions were reassigned mid-batch; the new owner redelivers
+            logger.warning("Offset commit failed after rebalance: %s", e)
+
+    async def _process_partition(
+        self,
+        tp: TopicPartition,
+        messages: list[ConsumerRecord]
+    ) -> list[tuple[ConsumerRecord, Exception]]:
+        """
+        Deserialize a partition's batch, then handle its records one by one
+        so per-key ordering is preserved. Handlers across all partitions
+        share the `handler_concurrency` bound.
+
+        Returns:
+            (record, error) for each record that failed
+        """
+        results = await self._deserialize_batch(messages)
+        failures = []
+        for message, result in zip(messages, results):
+            error = await self._handle_message(message, result)
+            if error is not None:
+                failures.append((message, error))
+        return failures
+
+    async def _publish_dead_letters(
+        self,
+        failures: list[tuple[ConsumerRecord, Exception]]
+    ) -> None:
+        """
+        Forward a batch's failed records to the dead-letter topic.
+
+        The raw key and value are republished with the error and source
+        position as headers. All sends are awaited together so they share
+        producer batches instead of a round trip per record.
+        """
+        if self._dlq_producer is None:
+            return
+
+        futures = []
+        for message, error in failures:
+            headers = [
+                ("error", f"{type(error).__name__}: {error}".encode()),
+                ("source_topic", message.topic.encode()),
+                ("source_partition", str(message.partition).encode()),
+                ("source_offset", str(message.offset).encode()),
+            ]
+            futures.append(await self._dlq_producer.send(
+                self.dlq_topic,
+                value=message.value,
+                key=message.key,
+                headers=headers
+            ))
+        await asyncio.gather(*futures)
+        logger.warning("Sent %d failed record(s) to '%s'", len(failures), self.dlq_topic)
+
+    async def _deserialize_batch(self, messages: list[ConsumerRecord]) -> list[Any]:
+        """
+        Decode a batch on the decode pool, keeping the event loop free.
+
+        Readers are resolved on the loop first, fetching unseen schemas, and
+        handed to the pool so worker threads never touch the reader cache.
+        The whole batch is then decoded in one pool job, as a per-record hop
+        would cost more than decoding a record. Failures are returned in place.
+        """
+        prepared = await asyncio.gather(
+            *(self._deserializer.prepare(m.value) for m in messages),
+            return_exceptions=True
+        )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._decode_pool, self._decode_all, messages, prepared
+        )
+
+    def _decode_all(self, messages: list[ConsumerRecord], prepared: list[Any]) -> list[Any]:
+        results = []
+        for message, reader in zip(messages, prepared):
+            if isinstance(reader, BaseException):
+                results.append(reader)
+                continue
+            try:
+                results.append(
+                    self._deserializer.deserialize_sync(message.value, reader, message.key)
+                )
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def _handle_message(
+        self,
+        message: ConsumerRecord,
+        deserialized_data: Any
+    ) -> Optional[Exception]:
+        """Run the handler for one record; returns the error if it failed."""
+        try:
+            if isinstance(deserialized_data, BaseException):
+                raise deserialized_data
+
+            if message.offset % LOG_SAMPLE_EVERY == 0:
+                logger.info(
+                    "Received message - Topic: %s, Partition: %s, Offset: %s, Key: %s",
+                    message.topic, message.partition, message.offset,
+                    # Keys stay raw bytes; decode only for the sampled log line
+                    message.key.decode('utf-8', 'replace') if message.key else None
+                )
+            logger.debug("Deserialized data: %s", deserialized_data)
+
+            handler = self._topic_handlers.get(message.topic, self._message_handler)
+            if handler:
+                async with self._handler_semaphore:
+                    await handler(deserialized_data)
+            elif logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "%s data: %s",
+                    self.__class__.__name__,
+                    orjson.dumps(deserialized_data, option=orjson.OPT_INDENT_2).decode()
+                )
+
+        except (asyncio.CancelledError, KeyboardInterrupt):
+            raise
+        except Exception as e:
+            logger.error(
+                "Error processing message from partition %s, offset %s: %s",
+                message.partition, message.offset, e,
+                exc_info=True
+            )
+            return e
+        return None
 
     async def close(self) -> None:
         """Close the Kafka consumer and schema registry connections."""
@@ -144,12 +456,24 @@ class KafkaListener(ABC):
             except Exception as e:
                 logger.error(f"Error stopping Kafka consumer: {e}")
 
-        if self._schema_registry:
+        if self._dlq_producer:
+            try:
+                await self._dlq_producer.stop()
+            except Exception as e:
+                logger.error(f"Error stopping DLQ producer: {e}")
+            self._dlq_producer = None
+
+        if self._decode_pool:
+            self._decode_pool.shutdown(wait=False, cancel_futures=True)
+            self._decode_pool = None
+
+        if self._schema_registry and self._owns_schema_registry:
             try:
                 await self._schema_registry.close()
                 logger.info("Schema Registry client closed")
             except Exception as e:
                 logger.error(f"Error closing Schema Registry client: {e}")
+            self._schema_registry = None
 
         self._started = False
         logger.info(f"{self.__class__.__name__} closed")
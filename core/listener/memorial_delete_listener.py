@@ -25,6 +25,9 @@ class MemorialDeleteListener(KafkaListener):
         auto_offset_reset: str = "earliest",
         enable_auto_commit: bool = True,
         schema_registry_auth: Optional[tuple[str, str]] = None,
+        fetch_min_bytes: Optional[int] = None,
+        fetch_max_wait_ms: Optional[int] = None,
+        max_partition_fetch_bytes: Optional[int] = None,
         **kwargs
     ):
         super().__init__(
@@ -35,5 +38,8 @@ class MemorialDeleteListener(KafkaListener):
             auto_offset_reset=auto_offset_reset,
             enable_auto_commit=enable_auto_commit,
             schema_registry_auth=schema_registry_auth,
+            fetch_min_bytes=fetch_min_bytes,
+            fetch_max_wait_ms=fetch_max_wait_ms,
+            max_partition_fetch_bytes=max_partition_fetch_bytes,
             **kwargs
         )
@@ -0,0 +1,56 @@
+from typing import Awaitable, Callable, Optional
+
+from core.serializer import SchemaRegistryClient
+
+from .kafka_listener import KafkaListener
+
+
+MEMORIAL_VECTORIZING_TOPIC = "memorial-vectorizing-request"
+MEMORIAL_VECTOR_DELETE_TOPIC = "memorial-vector-delete-request"
+
+
+class UnifiedMemorialListener(KafkaListener):
+    """
+    One consumer for both memorial topics, dispatching by message topic.
+
+    Replaces running MemorialVectorListener and MemorialDeleteListener side
+    by side, which costs a second set of broker connections, heartbeats
+    and metadata refreshes.
+    """
+
+    def __init__(
+        self,
+        bootstrap_servers: str | list[str],
+        schema_registry_url: str,
+        handlers: Optional[dict[str, Callable[[dict], Awaitable[None]]]] = None,
+        group_id: str = "feed",
+        auto_offset_reset: str = "earliest",
+        enable_auto_commit: bool = True,
+        schema_registry_auth: Optional[tuple[str, str]] = None,
+        fetch_min_bytes: Optional[int] = None,
+        fetch_max_wait_ms: Optional[int] = None,
+        max_partition_fetch_bytes: Optional[int] = None,
+        schema_registry_client: Optional[SchemaRegistryClient] = None,
+        dlq_topic: Optional[str] = None,
+        offset_seed_groups: Optional[dict[str, str]] = None,
+        **kwargs
+    ):
+        super().__init__(
+            topic=[MEMORIAL_VECTORIZING_TOPIC, MEMORIAL_VECTOR_DELETE_TOPIC],
+            bootstrap_servers=bootstrap_servers,
+            schema_registry_url=schema_registry_url,
+            group_id=group_id,
+            auto_offset_reset=auto_offset_reset,
+            enable_auto_commit=enable_auto_commit,
+            schema_registry_auth=schema_registry_auth,
+            fetch_min_bytes=fetch_min_bytes,
+            fetch_max_wait_ms=fetch_max_wait_ms,
+            max_partition_fetch_bytes=max_partition_fetch_bytes,
+            schema_registry_client=schema_registry_client,
+            dlq_topic=dlq_topic,
+            offset_seed_groups=offset_seed_groups,
+            **kwargs
+        )
+
+        for topic, handler in (handlers or {}).items():
+            self.set_message_handler(handler, topic=topic)
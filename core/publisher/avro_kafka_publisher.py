@@ -31,11 +31,12 @@ class AvroKafkaPublisher:
         schema_registry_url: Optional[str] = None,
         default_subject: Optional[str] = None,
         client_id: Optional[str] = None,
-        compression_type: Optional[str] = "gzip",
-        max_batch_size: int = 16384,
-        linger_ms: int = 10,
-        acks: str | int = "all",
+        compression_type: Optional[str] = "lz4",
+        max_batch_size: Optional[int] = None,
+        linger_ms: Optional[int] = None,
+        acks: str | int = 1,
         schema_registry_auth: Optional[tuple[str, str]] = None,
+        schema_registry_client: Optional[SchemaRegistryClient] = None,
         **kwargs
     ):
         """
@@ -46,11 +47,13 @@ class AvroKafkaPublisher:
             schema_registry_url: Schema Registry URL (defaults to env SCHEMA_REGISTRY_URL)
             default_subject: Default subject for schema registration
             client_id: Client identifier
-            compression_type: Compression type
-            max_batch_size: Maximum batch size in bytes
-            linger_ms: Time to wait before sending batch
+            compression_type: Compression type (lz4 needs cramjam)
+            max_batch_size: Maximum batch size in bytes (defaults to env BATCH_SIZE, 64KB)
+            linger_ms: Time to wait before sending batch (defaults to env LINGER_MS, 5)
             acks: Acknowledgment level
             schema_registry_auth: Optional (username, password) for Schema Registry
+            schema_registry_client: Shared Schema Registry client; when given it
+                is used instead of creating one and is left open by close()
             **kwargs: Additional producer configuration
         """
         import os
@@ -60,14 +63,16 @@ class AvroKafkaPublisher:
         self.default_subject = default_subject
         self.client_id = client_id or "avro-kafka-publisher"
         self.compression_type = compression_type
-        self.max_batch_size = max_batch_size
-        self.linger_ms = linger_ms
+        # Small response events are coalesced into larger compressed batches
+        self.max_batch_size = max_batch_size or int(os.getenv('BATCH_SIZE', 64 * 1024))
+        self.linger_ms = linger_ms if linger_ms is not None else int(os.getenv('LINGER_MS', 5))
         self.acks = acks
         self.schema_registry_auth = schema_registry_auth
         self.additional_config = kwargs
         
         self._producer: Optional[AIOKafkaProducer] = None
-        self._schema_registry: Optional[SchemaRegistryClient] = None
+        self._schema_registry: Optional[SchemaRegistryClient] = schema_registry_client
+        self._owns_schema_registry = schema_registry_client is None
         self._serializers: dict[str, AvroSerializer] = {}
         self._started = False
     
@@ -83,11 +88,12 @@ class AvroKafkaPublisher:
             return
         
         try:
-            # Initialize Schema Registry client
-            self._schema_registry = SchemaRegistryClient(
-                url=self.schema_registry_url,
-                auth=self.schema_registry_auth
-            )
+            # Initialize Schema Registry client unless a shared one was given
+            if self._schema_registry is None:
+                self._schema_registry = SchemaRegistryClient(
+                    url=self.schema_registry_url,
+                    auth=self.schema_registry_auth
+                )
             
             # Initialize Kafka producer (without value_serializer for raw bytes)
             self._producer = AIOKafkaProducer(
@@ -303,11 +309,12 @@ class AvroKafkaPublisher:
             except Exception as e:
                 logger.error(f"Error closing Kafka producer: {e}")
         
-        if self._schema_registry:
+        if self._schema_registry and self._owns_schema_registry:
             try:
                 await self._schema_registry.close()
             except Exception as e:
                 logger.error(f"Error closing Schema Registry client: {e}")
+            self._schema_registry = None
         
         self._started = False
         self._serializers.clear()
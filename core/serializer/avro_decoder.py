@@ -0,0 +1,194 @@
+"""
+Schema-specialized Avro binary decoders.
+
+compile_decoder() turns a parsed Avro schema into a generated Python
+function that reads the record field by field with straight-line code,
+so no per-message schema walk or type dispatch happens at decode time.
+"""
+
+import struct
+from typing import Any, Callable, Optional
+import avro.schema
+
+
+_FLOAT = struct.Struct("<f").unpack_from
+_DOUBLE = struct.Struct("<d").unpack_from
+
+
+def _read_long(buf: bytes, pos: int) -> tuple[int, int]:
+    """Read a zigzag varint-encoded int/long."""
+    b = buf[pos]
+    pos += 1
+    n = b & 0x7F
+    shift = 7
+    while b & 0x80:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        shift += 7
+    return (n >> 1) ^ -(n & 1), pos
+
+
+def _read_bytes(buf: bytes, pos: int) -> tuple[bytes, int]:
+    n, pos = _read_long(buf, pos)
+    end = pos + n
+    return bytes(buf[pos:end]), end
+
+
+def _read_string(buf: bytes, pos: int) -> tuple[str, int]:
+    n, pos = _read_long(buf, pos)
+    end = pos + n
+    return buf[pos:end].decode("utf-8"), end
+
+
+class _Unsupported(Exception):
+    """Schema uses a feature the generator leaves to DatumReader."""
+
+
+class _DecoderBuilder:
+    """Emits the source of a decode function for one schema."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self.constants: dict[str, Any] = {}
+        self._counter = 0
+        self._records: set[int] = set()
+
+    def var(self) -> str:
+        self._counter += 1
+        return f"v{self._counter}"
+
+    def constant(self, value: Any) -> str:
+        name = f"_c{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def emit(self, schema: avro.schema.Schema, target: str, indent: int) -> None:
+        """Append code that decodes `schema` into the variable `target`."""
+        pad = "    " * indent
+        out = self.lines.append
+
+        if schema.get_prop("logicalType"):
+            # DatumReader converts logical types (dates, decimals, ...)
+            raise _Unsupported(schema.get_prop("logicalType"))
+
+        kind = schema.type
+        if kind == "null":
+            out(f"{pad}{target} = None")
+        elif kind == "boolean":
+            out(f"{pad}{target} = buf[pos] == 1")
+            out(f"{pad}pos += 1")
+        elif kind in ("int", "long"):
+            out(f"{pad}{target}, pos = _read_long(buf, pos)")
+        elif kind == "float":
+            out(f"{pad}{target} = _FLOAT(buf, pos)[0]")
+            out(f"{pad}pos += 4")
+        elif kind == "double":
+            out(f"{pad}{target} = _DOUBLE(buf, pos)[0]")
+            out(f"{pad}pos += 8")
+        elif kind == "bytes":
+            out(f"{pad}{target}, pos = _read_bytes(buf, pos)")
+        elif kind == "string":
+            out(f"{pad}{target}, pos = _read_string(buf, pos)")
+        elif kind == "fixed":
+            out(f"{pad}{target} = bytes(buf[pos:pos + {schema.size}])")
+            out(f"{pad}pos += {schema.size}")
+        elif kind == "enum":
+            symbols = self.constant(tuple(schema.symbols))
+            index = self.var()
+            out(f"{pad}{index}, pos = _read_long(buf, pos)")
+            out(f"{pad}{target} = {symbols}[{index}]")
+        elif kind in ("record", "error"):
+            self._emit_record(schema, target, indent)
+        elif kind == "union":
+            index = self.var()
+            out(f"{pad}{index}, pos = _read_long(buf, pos)")
+            for i, branch in enumerate(schema.schemas):
+                out(f"{pad}{'if' if i == 0 else 'elif'} {index} == {i}:")
+                self.emit(branch, target, indent + 1)
+            out(f"{pad}else:")
+            out(f"{pad}    raise ValueError(f'Invalid union index: {{{index}}}')")
+        elif kind == "array":
+            self._emit_blocks(schema.items, target, indent, is_map=False)
+        elif kind == "map":
+            self._emit_blocks(schema.values, target, indent, is_map=True)
+        else:
+            raise _Unsupported(kind)
+
+    def _emit_record(self, schema: avro.schema.RecordSchema, target: str, indent: int) -> None:
+        if id(schema) in self._records:
+            # Recursive types can't be inlined
+            raise _Unsupported(f"recursive record {schema.fullname}")
+        self._records.add(id(schema))
+
+        pad = "    " * indent
+        names = []
+        for field in schema.fields:
+            value = self.var()
+            self.emit(field.type, value, indent)
+            names.append((field.name, value))
+        items = ", ".join(f"{name!r}: {value}" for name, value in names)
+        self.lines.append(f"{pad}{target} = {{{items}}}")
+
+        self._records.discard(id(schema))
+
+    def _emit_blocks(
+        self,
+        item_schema: avro.schema.Schema,
+        target: str,
+        indent: int,
+        is_map: bool
+    ) -> None:
+        pad = "    " * indent
+        out = self.lines.append
+        count = self.var()
+        item = self.var()
+
+        out(f"{pad}{target} = {{}}" if is_map else f"{pad}{target} = []")
+        out(f"{pad}while True:")
+        out(f"{pad}    {count}, pos = _read_long(buf, pos)")
+        out(f"{pad}    if {count} == 0:")
+        out(f"{pad}        break")
+        out(f"{pad}    if {count} < 0:")
+        out(f"{pad}        {count} = -{count}")
+        out(f"{pad}        _, pos = _read_long(buf, pos)")
+        out(f"{pad}    for _ in range({count}):")
+        if is_map:
+            key = self.var()
+            out(f"{pad}        {key}, pos = _read_string(buf, pos)")
+            self.emit(item_schema, item, indent + 2)
+            out(f"{pad}        {target}[{key}] = {item}")
+        else:
+            self.emit(item_schema, item, indent + 2)
+            out(f"{pad}        {target}.append({item})")
+
+
+def compile_decoder(schema: avro.schema.Schema) -> Optional[Callable[[bytes, int], Any]]:
+    """
+    Compile a decoder specialized for one writer schema.
+
+    Args:
+        schema: Parsed Avro schema the data was written with
+
+    Returns:
+        Function decode(buf, pos) returning the datum read from `buf`
+        starting at `pos`, or None if the schema uses logical types or
+        recursive records, which are left to avro's DatumReader
+    """
+    builder = _DecoderBuilder()
+    try:
+        builder.emit(schema, "result", 1)
+    except _Unsupported:
+        return None
+
+    source = "\n".join(["def _decode(buf, pos):", *builder.lines, "    return result"])
+    namespace = {
+        "_read_long": _read_long,
+        "_read_bytes": _read_bytes,
+        "_read_string": _read_string,
+        "_FLOAT": _FLOAT,
+        "_DOUBLE": _DOUBLE,
+        **builder.constants,
+    }
+    exec(compile(source, f"<avro decoder {getattr(schema, 'fullname', schema.type)}>", "exec"), namespace)
+    return namespace["_decode"]
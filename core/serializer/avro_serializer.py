@@ -6,17 +6,59 @@ for Avro-encoded Kafka messages with Schema Registry integration.
 """
 
 import io
+import asyncio
 import struct
 import logging
-from typing import Any, Optional
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
 import avro.schema
 import avro.io
+from cachetools import LRUCache
+from .avro_decoder import compile_decoder
 from .schema_registry_client import SchemaRegistryClient
 
 
 logger = logging.getLogger(__name__)
 
 
+class _BinaryCoderPool:
+    """
+    Free list of reusable Avro binary encoders or decoders.
+
+    BinaryEncoder/BinaryDecoder only hold a reference to their stream, so a
+    pooled instance is rebound to the caller's stream instead of being
+    constructed per message. list.pop/append keep the pool thread-safe.
+    """
+
+    def __init__(self, factory: Callable[[Any], Any], stream_attr: str):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Coder class, called with a stream on pool miss
+            stream_attr: Attribute holding the coder's stream
+        """
+        self._factory = factory
+        self._stream_attr = stream_attr
+        self._free: list = []
+
+    @contextmanager
+    def acquire(self, stream: io.BytesIO) -> Iterator[Any]:
+        """Borrow a coder bound to the given stream."""
+        try:
+            coder = self._free.pop()
+        except IndexError:
+            coder = self._factory(stream)
+        else:
+            setattr(coder, self._stream_attr, stream)
+
+        try:
+            yield coder
+        finally:
+            setattr(coder, self._stream_attr, None)
+            self._free.append(coder)
+
+
 class AvroSerializer:
     """
     Serializes Python dictionaries to Avro binary format.
@@ -50,6 +92,8 @@ class AvroSerializer:
         self.auto_register = auto_register
         self._schema_id: Optional[int] = None
         self._avro_schema: Optional[avro.schema.Schema] = None
+        self._datum_writer: Optional[avro.io.DatumWriter] = None
+        self._encoders = _BinaryCoderPool(avro.io.BinaryEncoder, "_writer")
     
     async def _ensure_schema_registered(self):
         """Ensure schema is registered and cached."""
@@ -88,6 +132,7 @@ class AvroSerializer:
             schema_json = self.schema_str
         
         self._avro_schema = avro.schema.parse(schema_json)
+        self._datum_writer = avro.io.DatumWriter(self._avro_schema)
     
     async def serialize(
         self,
@@ -107,8 +152,6 @@ class AvroSerializer:
         await self._ensure_schema_registered()
         
         try:
-            # Serialize to Avro
-            writer = avro.io.DatumWriter(self._avro_schema)
             bytes_writer = io.BytesIO()
             
             # Write Confluent wire format header
@@ -117,11 +160,11 @@ class AvroSerializer:
             bytes_writer.write(struct.pack('>I', self._schema_id))
             
             # Write Avro data
-            encoder = avro.io.BinaryEncoder(bytes_writer)
-            writer.write(data, encoder)
+            with self._encoders.acquire(bytes_writer) as encoder:
+                self._datum_writer.write(data, encoder)
             
             serialized = bytes_writer.getvalue()
-            logger.debug(f"Serialized message: {len(serialized)} bytes")
+            logger.debug("Serialized message: %d bytes", len(serialized))
             return serialized
         
         except Exception as e:
@@ -141,20 +184,32 @@ class AvroSerializer:
             )
         
         try:
-            writer = avro.io.DatumWriter(self._avro_schema)
             bytes_writer = io.BytesIO()
             
             bytes_writer.write(struct.pack('b', self.MAGIC_BYTE))
             bytes_writer.write(struct.pack('>I', self._schema_id))
             
-            encoder = avro.io.BinaryEncoder(bytes_writer)
-            writer.write(data, encoder)
+            with self._encoders.acquire(bytes_writer) as encoder:
+                self._datum_writer.write(data, encoder)
             
             return bytes_writer.getvalue()
         
         except Exception as e:
             logger.error(f"Serialization error: {e}")
             raise
+    
+    async def serialize_async(self, data: dict[str, Any]) -> bytes:
+        """
+        Serialize data on a worker thread so the event loop stays responsive.
+
+        Args:
+            data: Data to serialize
+
+        Returns:
+            Serialized bytes with schema ID prefix
+        """
+        await self._ensure_schema_registered()
+        return await asyncio.to_thread(self.__call__, data)
 
 
 class AvroDeserializer:
@@ -166,20 +221,101 @@ class AvroDeserializer:
 
     MAGIC_BYTE = 0
     
-    def __init__(self, schema_registry_client: SchemaRegistryClient):
+    def __init__(
+        self,
+        schema_registry_client: SchemaRegistryClient,
+        reader_cache_size: int = 128,
+        use_compiled_decoders: bool = True
+    ):
         """
         Initialize Avro deserializer.
 
         Args:
             schema_registry_client: Schema Registry client
+            reader_cache_size: Max readers kept, one per schema ID
+            use_compiled_decoders: Decode with a function generated per
+                schema, falling back to DatumReader for schemas it can't
+                handle (logical types, recursive records)
         """
         self.schema_registry_client = schema_registry_client
-        self._schema_cache: dict[int, avro.schema.Schema] = {}
+        self.use_compiled_decoders = use_compiled_decoders
+        # (DatumReader, compiled decoder or None) per schema ID; reads keep
+        # no per-call state, so one entry serves every message of a schema
+        self._reader_cache: LRUCache = LRUCache(maxsize=reader_cache_size)
+        self._decoders = _BinaryCoderPool(avro.io.BinaryDecoder, "_reader")
+    
+    async def _get_reader(
+        self,
+        schema_id: int
+    ) -> tuple[avro.io.DatumReader, Optional[Callable[[bytes, int], Any]]]:
+        """Return the cached readers for a schema ID, fetching on a miss."""
+        entry = self._reader_cache.get(schema_id)
+        if entry is None:
+            schema_str = await self.schema_registry_client.get_schema_by_id(
+                schema_id
+            )
+            entry = self._build_reader(schema_id, schema_str)
+        return entry
+    
+    def _build_reader(
+        self,
+        schema_id: int,
+        schema_str: str
+    ) -> tuple[avro.io.DatumReader, Optional[Callable[[bytes, int], Any]]]:
+        """Parse a writer schema, compile its decoder and cache both."""
+        schema = avro.schema.parse(schema_str)
+        decode = compile_decoder(schema) if self.use_compiled_decoders else None
+        entry = (avro.io.DatumReader(schema), decode)
+        self._reader_cache[schema_id] = entry
+        return entry
+    
+    async def prefetch_subject(self, subject: str) -> int:
+        """
+        Warm the reader cache with the latest schema of a subject.
+
+        Lets the first message written with that schema skip the registry
+        round trip, schema parse and decoder compilation.
+
+        Args:
+            subject: Subject name (e.g., "topic-value")
+
+        Returns:
+            Schema ID of the prefetched schema
+        """
+        metadata = await self.schema_registry_client.get_latest_schema(subject)
+        if metadata.schema_id not in self._reader_cache:
+            self._build_reader(metadata.schema_id, metadata.schema)
+        return metadata.schema_id
+    
+    def _parse_header(self, data: bytes) -> int:
+        """Validate the Confluent wire format header and return the schema ID."""
+        if len(data) < 5:
+            raise ValueError(f"Message too short for wire format: {len(data)} bytes")
+        
+        magic_byte, schema_id = struct.unpack_from('>bI', data)
+        if magic_byte != self.MAGIC_BYTE:
+            raise ValueError(f"Invalid magic byte: {magic_byte}")
+        return schema_id
+    
+    def _read_payload(
+        self,
+        entry: tuple[avro.io.DatumReader, Optional[Callable[[bytes, int], Any]]],
+        data: bytes
+    ) -> dict[str, Any]:
+        """Decode the Avro payload following the 5-byte header."""
+        reader, decode = entry
+        if decode is not None:
+            return decode(data, 5)
+        
+        bytes_reader = io.BytesIO(data)
+        bytes_reader.seek(5)
+        with self._decoders.acquire(bytes_reader) as decoder:
+            return reader.read(decoder)
     
     async def deserialize(
         self,
         data: bytes,
-        key: Optional[str] = None
+        key: Optional[str | bytes] = None
     ) -> dict[str, Any]:
         """
         Deserialize Avro binary data to Python dictionary.
@@ -195,30 +331,16 @@ class AvroDeserializer:
             return None
         
         try:
-            bytes_reader = io.BytesIO(data)
-            
             # Read Confluent wire format header
-            magic_byte = struct.unpack('b', bytes_reader.read(1))[0]
-            if magic_byte != self.MAGIC_BYTE:
-                raise ValueError(f"Invalid magic byte: {magic_byte}")
+            schema_id = self._parse_header(data)
             
-            schema_id = struct.unpack('>I', bytes_reader.read(4))[0]
-            
-            # Get schema from cache or registry
-            if schema_id not in self._schema_cache:
-                schema_str = await self.schema_registry_client.get_schema_by_id(
-                    schema_id
-                )
-                self._schema_cache[schema_id] = avro.schema.parse(schema_str)
-            
-            avro_schema = self._schema_cache[schema_id]
+            # Get reader from cache or registry
+            entry = await self._get_reader(schema_id)
             
             # Deserialize Avro data
-            decoder = avro.io.BinaryDecoder(bytes_reader)
-            reader = avro.io.DatumReader(avro_schema)
-            result = reader.read(decoder)
+            result = self._read_payload(entry, data)
             
-            logger.debug(f"Deserialized message using schema ID {schema_id}")
+            logger.debug("Deserialized message using schema ID %s", schema_id)
             return result
         
         except Exception as e:
@@ -236,25 +358,86 @@ class AvroDeserializer:
             return None
         
         try:
-            bytes_reader = io.BytesIO(data)
-            
-            magic_byte = struct.unpack('b', bytes_reader.read(1))[0]
-            if magic_byte != self.MAGIC_BYTE:
-                raise ValueError(f"Invalid magic byte: {magic_byte}")
+            schema_id = self._parse_header(data)
             
-            schema_id = struct.unpack('>I', bytes_reader.read(4))[0]
-            
-            if schema_id not in self._schema_cache:
+            entry = self._reader_cache.get(schema_id)
+            if entry is None:
                 raise RuntimeError(
                     f"Schema {schema_id} not in cache. Use deserialize() in async context."
                 )
             
-            avro_schema = self._schema_cache[schema_id]
-            
-            decoder = avro.io.BinaryDecoder(bytes_reader)
-            reader = avro.io.DatumReader(avro_schema)
-            return reader.read(decoder)
+            return self._read_payload(entry, data)
         
         except Exception as e:
             logger.error(f"Deserialization error: {e}")
             raise
+    
+    def deserialize_sync(
+        self,
+        data: bytes,
+        reader: tuple[avro.io.DatumReader, Optional[Callable[[bytes, int], Any]]],
+        key: Optional[str | bytes] = None
+    ) -> dict[str, Any]:
+        """
+        Deserialize with a reader resolved by prepare().
+
+        Safe to call from worker threads: the reader cache is not thread-safe
+        (even a lookup reorders it), so it is only touched on the event loop
+        by prepare() and the reader is handed over explicitly.
+
+        Args:
+            data: Serialized Avro data with Confluent wire format
+            reader: Reader entry returned by prepare() for this message
+            key: Optional message key (not used, just for logging)
+
+        Returns:
+            Deserialized data as dictionary
+        """
+        if data is None or len(data) == 0:
+            return None
+        return self._read_payload(reader, data)
+    
+    async def prepare(
+        self,
+        data: bytes
+    ) -> Optional[tuple[avro.io.DatumReader, Optional[Callable[[bytes, int], Any]]]]:
+        """
+        Resolve the reader for the schema a message was written with.
+
+        Args:
+            data: Serialized Avro data with Confluent wire format
+
+        Returns:
+            Reader entry to pass to deserialize_sync(), or None for an empty
+            message
+        """
+        if not data:
+            return None
+        return await self._get_reader(self._parse_header(data))
+    
+    async def deserialize_async(
+        self,
+        data: bytes,
+        key: Optional[str | bytes] = None
+    ) -> dict[str, Any]:
+        """
+        Deserialize Avro binary data on a worker thread.
+
+        The schema is fetched inline on a cache miss; only the CPU-bound
+        decode is offloaded.
+
+        Args:
+            data: Serialized Avro data with Confluent wire format
+            key: Optional message key (not used, just for logging)
+
+        Returns:
+            Deserialized data as dictionary
+        """
+        if data is None or len(data) == 0:
+            return None
+        
+        schema_id = self._parse_header(data)
+        entry = await self._get_reader(schema_id)
+        
+        # Resolved on the loop; the worker must not touch the reader cache
+        return await asyncio.to_thread(self._read_payload, entry, data)
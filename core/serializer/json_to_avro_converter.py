@@ -8,9 +8,10 @@ This module provides functionality to:
 """
 
 import json
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from datetime import datetime
 from decimal import Decimal
+import msgspec
 
 
 class JsonToAvroConverter:
@@ -33,13 +34,35 @@ class JsonToAvroConverter:
         bytes: "bytes",
     }
     
+    # Avro primitives that map directly onto msgspec-typed fields
+    MSGSPEC_TYPE_MAPPING = {
+        "string": str,
+        "int": int,
+        "long": int,
+        "float": float,
+        "double": float,
+        "boolean": bool,
+    }
+    
+    # Compiled plans keyed by (kind, id(schema)); the schema object is kept
+    # alongside so its id cannot be reused while the entry is alive
+    _COMPILED_CACHE: dict[tuple[str, int], tuple[Any, Any]] = {}
+    _COMPILED_CACHE_LIMIT = 256
+    
     @staticmethod
-    def infer_avro_type(value: Any) -> str | dict | list:
+    def infer_avro_type(
+        value: Any,
+        *,
+        name: Optional[str] = None,
+        namespace: Optional[str] = None
+    ) -> str | dict | list:
         """
         Infer Avro type from a Python value.
         
         Args:
             value: Python value to infer type from
+            name: Record name for dict values (defaults to "NestedRecord")
+            namespace: Optional record namespace for dict values
             
         Returns:
             Avro type specification (string or complex type dict)
@@ -75,11 +98,11 @@ class JsonToAvroConverter:
                     "type": ["null", field_type] if val is not None else "null",
                     "default": None
                 })
-            return {
-                "type": "record",
-                "name": "NestedRecord",
-                "fields": fields
-            }
+            record = {"type": "record", "name": name or "NestedRecord"}
+            if namespace:
+                record["namespace"] = namespace
+            record["fields"] = fields
+            return record
         
         # Default to string for unknown types
         return "string"
@@ -101,107 +124,243 @@ class JsonToAvroConverter:
         Returns:
             Avro schema as a dictionary
         """
-        fields = []
+        return JsonToAvroConverter.infer_avro_type(
+            data, name=schema_name, namespace=namespace
+        )
+    
+    @staticmethod
+    def _get_compiled(kind: str, schema: Any, build: Callable[[Any], Any]) -> Any:
+        """
+        Return the compiled plan for a schema, building it on first use.
         
-        for key, value in data.items():
-            avro_type = JsonToAvroConverter.infer_avro_type(value)
-            
-            # Make fields nullable by default
-            if value is not None and avro_type != "null":
-                field_type = ["null", avro_type]
-                default = None
-            else:
-                field_type = "null"
-                default = None
+        Args:
+            kind: Plan kind, so one schema can own several plans
+            schema: Avro schema or type the plan is built from
+            build: Factory called with the schema on a cache miss
             
-            fields.append({
-                "name": key,
-                "type": field_type,
-                "default": default
-            })
-        
-        schema = {
-            "type": "record",
-            "name": schema_name,
-            "namespace": namespace,
-            "fields": fields
-        }
-        
-        return schema
+        Returns:
+            Compiled plan
+        """
+        cache = JsonToAvroConverter._COMPILED_CACHE
+        key = (kind, id(schema))
+        cached = cache.get(key)
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        
+        plan = build(schema)
+        if len(cache) >= JsonToAvroConverter._COMPILED_CACHE_LIMIT:
+            cache.clear()
+        cache[key] = (schema, plan)
+        return plan
     
     @staticmethod
-    def convert_value(value: Any, avro_type: str | dict | list) -> Any:
+    def compile_converter(avro_type: str | dict | list) -> Callable[[Any], Any]:
         """
-        Convert a Python value to Avro-compatible format.
+        Build a converter function specialized for an Avro type.
+        
+        Type dispatch happens once here instead of on every value.
         
         Args:
-            value: Python value to convert
             avro_type: Target Avro type
             
         Returns:
-            Avro-compatible value
+            Function converting a Python value to Avro-compatible format
         """
-        if value is None:
-            return None
-        
         # Handle union types (e.g., ["null", "string"])
         if isinstance(avro_type, list):
-            # Find the non-null type
             for t in avro_type:
                 if t != "null":
-                    return JsonToAvroConverter.convert_value(value, t)
-            return None
+                    return JsonToAvroConverter.compile_converter(t)
+            return lambda value: None
         
         # Handle complex types
         if isinstance(avro_type, dict):
             avro_type_name = avro_type.get("type")
             
             if avro_type_name == "array":
-                if not isinstance(value, list):
-                    value = [value]
-                items_type = avro_type.get("items")
-                return [
-                    JsonToAvroConverter.convert_value(item, items_type)
-                    for item in value
-                ]
+                convert_item = JsonToAvroConverter.compile_converter(
+                    avro_type.get("items")
+                )
+                
+                def convert_array(value):
+                    if value is None:
+                        return None
+                    if not isinstance(value, list):
+                        value = [value]
+                    return [convert_item(item) for item in value]
+                
+                return convert_array
             
             elif avro_type_name == "record":
-                if not isinstance(value, dict):
-                    return value
-                
-                result = {}
-                fields = avro_type.get("fields", [])
-                for field in fields:
-                    field_name = field["name"]
-                    field_type = field["type"]
-                    field_value = value.get(field_name)
-                    result[field_name] = JsonToAvroConverter.convert_value(
-                        field_value, field_type
-                    )
-                return result
+                return JsonToAvroConverter._compile_record(
+                    avro_type.get("fields", []), use_defaults=False
+                )
             
             elif avro_type_name == "map":
-                values_type = avro_type.get("values")
-                return {
-                    k: JsonToAvroConverter.convert_value(v, values_type)
-                    for k, v in value.items()
-                }
+                convert_item = JsonToAvroConverter.compile_converter(
+                    avro_type.get("values")
+                )
+                
+                def convert_map(value):
+                    if value is None:
+                        return None
+                    return {k: convert_item(v) for k, v in value.items()}
+                
+                return convert_map
+            
+            return lambda value: value
         
         # Handle primitive types
-        if avro_type in ["int", "long"]:
-            return int(value) if value is not None else None
-        elif avro_type == "float" or avro_type == "double":
-            return float(value) if value is not None else None
+        if avro_type in ("int", "long"):
+            cast = int
+        elif avro_type in ("float", "double"):
+            cast = float
         elif avro_type == "boolean":
-            return bool(value) if value is not None else None
+            cast = bool
         elif avro_type == "string":
-            return str(value) if value is not None else None
+            cast = str
         elif avro_type == "bytes":
-            if isinstance(value, str):
-                return value.encode('utf-8')
-            return value
+            def convert_bytes(value):
+                if isinstance(value, str):
+                    return value.encode('utf-8')
+                return value
+            return convert_bytes
+        else:
+            return lambda value: value
         
-        return value
+        return lambda value: None if value is None else cast(value)
+    
+    @staticmethod
+    def _compile_record(
+        fields: list[dict],
+        use_defaults: bool
+    ) -> Callable[[Any], Any]:
+        """
+        Build a converter for a record's fields.
+        
+        Field names and converters are materialized once so a conversion is
+        a single pass building the result dict.
+        
+        Args:
+            fields: Avro record fields
+            use_defaults: Whether to substitute field defaults for None values
+            
+        Returns:
+            Function converting a dict to an Avro-compatible record
+        """
+        names = tuple(field["name"] for field in fields)
+        converters = tuple(
+            JsonToAvroConverter.compile_converter(field["type"])
+            for field in fields
+        )
+        
+        if use_defaults:
+            defaults = tuple(field.get("default") for field in fields)
+            
+            def convert_record(value):
+                get = value.get
+                return dict(zip(names, [
+                    convert(default if (v := get(name)) is None else v)
+                    for name, default, convert in zip(names, defaults, converters)
+                ]))
+        else:
+            def convert_record(value):
+                if value is None:
+                    return None
+                if not isinstance(value, dict):
+                    return value
+                get = value.get
+                return dict(zip(names, [
+                    convert(get(name)) for name, convert in zip(names, converters)
+                ]))
+        
+        return convert_record
+    
+    @staticmethod
+    def compile_msgspec_struct(schema: dict) -> Optional[type[msgspec.Struct]]:
+        """
+        Build a msgspec Struct type mirroring an Avro record schema.
+        
+        Args:
+            schema: Avro record schema
+            
+        Returns:
+            Struct type, or None if the schema uses types without a direct
+            msgspec equivalent (bytes, enums, fixed, logical types, ...)
+        """
+        try:
+            return JsonToAvroConverter._msgspec_record(schema, use_defaults=True)
+        except (ValueError, TypeError):
+            return None
+    
+    @staticmethod
+    def _msgspec_record(schema: dict, use_defaults: bool) -> type[msgspec.Struct]:
+        """
+        Build a Struct type for a record, raising ValueError on exotic types.
+        
+        Nested records default every field to None, matching convert_value,
+        while the top-level record honours field defaults like json_to_avro.
+        """
+        struct_fields = []
+        for field in schema.get("fields", []):
+            field_type = JsonToAvroConverter._msgspec_type(field["type"])
+            default = None
+            if use_defaults and "default" in field:
+                default = JsonToAvroConverter.compile_converter(field["type"])(
+                    field["default"]
+                )
+                if default is not None and isinstance(field["type"], list):
+                    raise ValueError("Nullable field with non-null default")
+            struct_fields.append((field["name"], field_type, default))
+        
+        return msgspec.defstruct(schema.get("name", "Record"), struct_fields)
+    
+    @staticmethod
+    def _msgspec_type(avro_type: str | dict | list) -> Any:
+        """Map an Avro type to a msgspec-compatible Python type."""
+        if isinstance(avro_type, list):
+            non_null = [t for t in avro_type if t != "null"]
+            if len(non_null) != 1:
+                raise ValueError(f"Unsupported union: {avro_type}")
+            return Optional[JsonToAvroConverter._msgspec_type(non_null[0])]
+        
+        if isinstance(avro_type, dict):
+            if "logicalType" in avro_type:
+                raise ValueError(f"Unsupported logical type: {avro_type}")
+            
+            avro_type_name = avro_type.get("type")
+            if avro_type_name == "array":
+                return list[JsonToAvroConverter._msgspec_type(avro_type.get("items"))]
+            elif avro_type_name == "map":
+                return dict[str, JsonToAvroConverter._msgspec_type(avro_type.get("values"))]
+            elif avro_type_name == "record":
+                return JsonToAvroConverter._msgspec_record(avro_type, use_defaults=False)
+            raise ValueError(f"Unsupported type: {avro_type_name}")
+        
+        python_type = JsonToAvroConverter.MSGSPEC_TYPE_MAPPING.get(avro_type)
+        if python_type is None:
+            raise ValueError(f"Unsupported type: {avro_type}")
+        return python_type
+    
+    @staticmethod
+    def convert_value(value: Any, avro_type: str | dict | list) -> Any:
+        """
+        Convert a Python value to Avro-compatible format.
+        
+        Args:
+            value: Python value to convert
+            avro_type: Target Avro type
+            
+        Returns:
+            Avro-compatible value
+        """
+        if value is None:
+            return None
+        
+        convert = JsonToAvroConverter._get_compiled(
+            "converter", avro_type, JsonToAvroConverter.compile_converter
+        )
+        return convert(value)
     
     @staticmethod
     def json_to_avro(
@@ -221,23 +380,30 @@ class JsonToAvroConverter:
         if schema.get("type") != "record":
             raise ValueError("Schema must be a record type")
         
-        result = {}
-        fields = schema.get("fields", [])
+        struct_type = JsonToAvroConverter._get_compiled(
+            "struct", schema, JsonToAvroConverter.compile_msgspec_struct
+        )
+        if struct_type is not None:
+            # Strict: only already well-typed data takes the fast path, where
+            # the casts below are no-ops. Lax msgspec coercion differs from
+            # them (e.g. "false" -> False vs bool("false") -> True), which
+            # would make a field's result depend on its sibling fields
+            try:
+                return msgspec.to_builtins(
+                    msgspec.convert(json_data, type=struct_type, strict=True)
+                )
+            except msgspec.ValidationError:
+                # Values needing Python-level coercion (e.g. int -> string)
+                pass
         
-        for field in fields:
-            field_name = field["name"]
-            field_type = field["type"]
-            field_value = json_data.get(field_name)
-            
-            # Use default value if field is missing
-            if field_value is None and "default" in field:
-                field_value = field["default"]
-            
-            result[field_name] = JsonToAvroConverter.convert_value(
-                field_value, field_type
+        convert = JsonToAvroConverter._get_compiled(
+            "record",
+            schema,
+            lambda s: JsonToAvroConverter._compile_record(
+                s.get("fields", []), use_defaults=True
             )
-        
-        return result
+        )
+        return convert(json_data)
     
     @staticmethod
     def validate_against_schema(
@@ -258,29 +424,19 @@ class JsonToAvroConverter:
             if schema.get("type") != "record":
                 return False, "Schema must be a record type"
             
-            fields = schema.get("fields", [])
-            schema_fields = {f["name"] for f in fields}
-            required_fields = {
-                f["name"] for f in fields 
-                if "default" not in f and "null" not in str(f.get("type"))
-            }
-            
-            data_fields = set(data.keys())
+            schema_fields, required_fields, field_checks = JsonToAvroConverter._get_compiled(
+                "validator", schema, JsonToAvroConverter._compile_validator_plan
+            )
             
             # Check for missing required fields
-            missing_fields = required_fields - data_fields
+            missing_fields = {f for f in required_fields if f not in data}
             if missing_fields:
                 return False, f"Missing required fields: {missing_fields}"
             
             # Validate each field type
-            for field in fields:
-                field_name = field["name"]
-                field_type = field["type"]
-                
-                if field_name in data:
-                    value = data[field_name]
-                    if not JsonToAvroConverter._validate_type(value, field_type):
-                        return False, f"Invalid type for field '{field_name}'"
+            for field_name, check in field_checks:
+                if field_name in data and not check(data[field_name]):
+                    return False, f"Invalid type for field '{field_name}'"
             
             return True, None
             
@@ -288,52 +444,122 @@ class JsonToAvroConverter:
             return False, str(e)
     
     @staticmethod
-    def _validate_type(value: Any, avro_type: str | dict | list) -> bool:
+    def _compile_validator_plan(
+        schema: dict
+    ) -> tuple[frozenset, frozenset, tuple[tuple[str, Callable[[Any], bool]], ...]]:
         """
-        Validate that a value matches an Avro type.
+        Precompute everything validate_against_schema needs for a schema.
+        
+        Args:
+            schema: Avro record schema
+            
+        Returns:
+            Tuple of (schema_fields, required_fields, field_checks)
+        """
+        fields = schema.get("fields", [])
+        schema_fields = frozenset(f["name"] for f in fields)
+        required_fields = frozenset(
+            f["name"] for f in fields
+            if "default" not in f and "null" not in str(f.get("type"))
+        )
+        field_checks = tuple(
+            (f["name"], JsonToAvroConverter.compile_validator(f["type"]))
+            for f in fields
+        )
+        return schema_fields, required_fields, field_checks
+    
+    # Primitive type checking
+    _PRIMITIVE_CHECKS = {
+        "string": lambda v: isinstance(v, str),
+        "int": lambda v: isinstance(v, int) and -2147483648 <= v <= 2147483647,
+        "long": lambda v: isinstance(v, int),
+        "float": lambda v: isinstance(v, (int, float)),
+        "double": lambda v: isinstance(v, (int, float)),
+        "boolean": lambda v: isinstance(v, bool),
+        "bytes": lambda v: isinstance(v, (bytes, bytearray)),
+        "null": lambda v: v is None,
+    }
+    
+    # Primitives whose check is a plain isinstance test
+    _PRIMITIVE_PY_TYPES = {
+        "string": str,
+        "long": int,
+        "float": (int, float),
+        "double": (int, float),
+        "boolean": bool,
+        "bytes": (bytes, bytearray),
+    }
+    
+    @staticmethod
+    def compile_validator(avro_type: str | dict | list) -> Callable[[Any], bool]:
+        """
+        Build a type-check function specialized for an Avro type.
+        
+        Unions are collapsed up front, so the common ["null", X] case is a
+        single isinstance test instead of an any() over the members.
         
         Args:
-            value: Value to validate
             avro_type: Avro type specification
             
         Returns:
-            True if valid, False otherwise
+            Function returning True if a value matches the type
         """
-        if value is None:
-            if isinstance(avro_type, list):
-                return "null" in avro_type
-            return avro_type == "null"
+        if isinstance(avro_type, list):
+            accepts_null = "null" in avro_type
+            members = [t for t in avro_type if t != "null"]
+            if len(members) == 1 and isinstance(members[0], str):
+                py_type = JsonToAvroConverter._PRIMITIVE_PY_TYPES.get(members[0])
+                if py_type is not None:
+                    if accepts_null:
+                        return lambda v: v is None or isinstance(v, py_type)
+                    return lambda v: isinstance(v, py_type)
+        else:
+            accepts_null = avro_type == "null"
         
+        check = JsonToAvroConverter._compile_value_check(avro_type)
+        if accepts_null:
+            return lambda v: v is None or check(v)
+        return lambda v: v is not None and check(v)
+    
+    @staticmethod
+    def _compile_value_check(avro_type: str | dict | list) -> Callable[[Any], bool]:
+        """Build a type check for values already known to be non-None."""
         if isinstance(avro_type, list):
             # Union type - check if value matches any type
-            return any(
-                JsonToAvroConverter._validate_type(value, t)
+            checks = tuple(
+                JsonToAvroConverter._compile_value_check(t)
                 for t in avro_type if t != "null"
             )
+            if len(checks) == 1:
+                return checks[0]
+            return lambda v: any(check(v) for check in checks)
         
         if isinstance(avro_type, dict):
             type_name = avro_type.get("type")
             if type_name == "array":
-                return isinstance(value, list)
-            elif type_name == "record":
-                return isinstance(value, dict)
-            elif type_name == "map":
-                return isinstance(value, dict)
-        
-        # Primitive type checking
-        type_checks = {
-            "string": lambda v: isinstance(v, str),
-            "int": lambda v: isinstance(v, int) and -2147483648 <= v <= 2147483647,
-            "long": lambda v: isinstance(v, int),
-            "float": lambda v: isinstance(v, (int, float)),
-            "double": lambda v: isinstance(v, (int, float)),
-            "boolean": lambda v: isinstance(v, bool),
-            "bytes": lambda v: isinstance(v, (bytes, bytearray)),
-            "null": lambda v: v is None,
-        }
-        
-        check = type_checks.get(avro_type)
-        return check(value) if check else False
+                return lambda v: isinstance(v, list)
+            elif type_name in ("record", "map"):
+                return lambda v: isinstance(v, dict)
+            return lambda v: False
+        
+        return JsonToAvroConverter._PRIMITIVE_CHECKS.get(avro_type, lambda v: False)
+    
+    @staticmethod
+    def _validate_type(value: Any, avro_type: str | dict | list) -> bool:
+        """
+        Validate that a value matches an Avro type.
+        
+        Args:
+            value: Value to validate
+            avro_type: Avro type specification
+            
+        Returns:
+            True if valid, False otherwise
+        """
+        check = JsonToAvroConverter._get_compiled(
+            "type_check", avro_type, JsonToAvroConverter.compile_validator
+        )
+        return check(value)
     
     @staticmethod
     def schema_to_json_string(schema: dict) -> str:
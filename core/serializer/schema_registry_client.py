@@ -5,16 +5,61 @@ This module provides a client for interacting with Confluent Schema Registry
 to register, retrieve, and manage Avro schemas.
 """
 
+import asyncio
 import logging
-from typing import Optional
+import time
+from typing import Any, Awaitable, Callable, Hashable, Optional
 import aiohttp
+import orjson
+from cachetools import LRUCache, TTLCache
 from dataclasses import dataclass
 
+from core.util.http_util import create_session, get_default_session
+
 
 logger = logging.getLogger(__name__)
 
+SCHEMA_REGISTRY_CONTENT_TYPE = "application/vnd.schemaregistry.v1+json"
+
+# Dict schemas with at least this many top-level fields are serialized in
+# a worker thread; smaller ones are cheaper to serialize than to hand off
+LARGE_SCHEMA_FIELDS = 64
+
+# Minimum seconds between cache stats log lines, written on eviction
+CACHE_STATS_INTERVAL = 300.0
+
+
+class _FetchAbandoned(Exception):
+    """The caller running a shared fetch was cancelled before it finished."""
+
+
+class _StatsLRUCache(LRUCache):
+    """LRUCache that counts evictions and periodically logs its stats."""
+
+    def __init__(self, name: str, maxsize: int, stats_interval: float = CACHE_STATS_INTERVAL):
+        super().__init__(maxsize=maxsize)
+        self.name = name
+        self.stats_interval = stats_interval
+        self.evictions = 0
+        self._last_stats = time.monotonic()
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        now = time.monotonic()
+        if now - self._last_stats >= self.stats_interval:
+            self._last_stats = now
+            logger.info(
+                "Schema Registry %s cache: size=%d/%d, evictions=%d",
+                self.name, self.currsize, self.maxsize, self.evictions
+            )
+        return item
+
+    def stats(self) -> dict[str, int]:
+        return {"size": self.currsize, "maxsize": self.maxsize, "evictions": self.evictions}
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SchemaMetadata:
     """Metadata about a registered schema."""
     schema_id: int
@@ -34,7 +79,13 @@ class SchemaRegistryClient:
         self,
         url: str,
         timeout: int = 30,
-        auth: Optional[tuple[str, str]] = None
+        auth: Optional[tuple[str, str]] = None,
+        ttl: float = 30.0,
+        refresh_window: float = 5.0,
+        own_session: bool = False,
+        negative_ttl: float = 5.0,
+        schema_cache_size: int = 1000,
+        id_cache_size: int = 1000
     ):
         """
         Initialize Schema Registry client.
@@ -43,13 +94,50 @@ class SchemaRegistryClient:
             url: Schema Registry URL (e.g., "http://localhost:8081")
             timeout: Request timeout in seconds
             auth: Optional (username, password) tuple for authentication
+            ttl: Seconds a cached latest-schema entry stays valid
+            refresh_window: Seconds before expiry in which a read triggers
+                a background refresh while still serving the cached entry
+            own_session: Create a private session instead of sharing the
+                process-wide one; only an owned session is closed by close()
+            negative_ttl: Seconds a 404 for a schema ID or subject is
+                remembered, failing repeat lookups without a request
+            schema_cache_size: Max subjects kept in the latest-schema cache
+            id_cache_size: Max schemas kept in the schema-ID cache
         """
         self.url = url.rstrip('/')
         self.timeout = aiohttp.ClientTimeout(total=timeout)
         self.auth = aiohttp.BasicAuth(*auth) if auth else None
+        self._own_session = own_session
         self._session: Optional[aiohttp.ClientSession] = None
-        self._schema_cache: dict[str, SchemaMetadata] = {}
-        self._id_cache: dict[int, str] = {}
+        # Sent with every request since the session may be shared
+        self._request_kwargs = {
+            "timeout": self.timeout,
+            "auth": self.auth,
+            "headers": {"Accept": SCHEMA_REGISTRY_CONTENT_TYPE}
+        }
+        self._post_kwargs = {
+            **self._request_kwargs,
+            "headers": {
+                "Accept": SCHEMA_REGISTRY_CONTENT_TYPE,
+                "Content-Type": SCHEMA_REGISTRY_CONTENT_TYPE
+            }
+        }
+        self.ttl = ttl
+        self.refresh_window = refresh_window
+        # LRU-bounded so schema churn in a long-lived process can't grow
+        # them without limit; latest-schema entries carry their own expiry
+        # (subject -> (SchemaMetadata, expires_at)) and (schema_id -> schema)
+        self._schema_cache = _StatsLRUCache("subject", schema_cache_size)
+        self._id_cache = _StatsLRUCache("schema-ID", id_cache_size)
+        self._inflight_id: dict[int, asyncio.Future] = {}
+        self._inflight_subject: dict[str, asyncio.Future] = {}
+        self._refresh_tasks: set[asyncio.Task] = set()
+        # Schema IDs / subjects the registry answered 404 for, with a short
+        # TTL so poison messages don't turn into a lookup storm
+        self._neg_cache: TTLCache = TTLCache(maxsize=1024, ttl=negative_ttl)
+        # Canonical JSON per schema dict, keyed by id(); the dict is kept
+        # alongside so its id cannot be reused while the entry is alive
+        self._canon_cache: dict[int, tuple[dict, str]] = {}
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -63,14 +151,17 @@ class SchemaRegistryClient:
     async def _ensure_session(self):
         """Ensure aiohttp session exists."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                timeout=self.timeout,
-                auth=self.auth
-            )
+            if self._own_session:
+                self._session = create_session()
+            else:
+                self._session = await get_default_session()
     
     async def close(self):
-        """Close the client session."""
-        if self._session and not self._session.closed:
+        """Cancel background refreshes and close the session if owned."""
+        for task in self._refresh_tasks:
+            task.cancel()
+        
+        if self._own_session and self._session and not self._session.closed:
             await self._session.close()
     
     async def register_schema(
@@ -88,32 +179,45 @@ class SchemaRegistryClient:
         Returns:
             Schema ID assigned by the registry
         """
-        await self._ensure_session()
+        schema_str = await self._canonicalize(schema)
         
-        # Convert dict to JSON string if needed
-        if isinstance(schema, dict):
-            import json
-            schema_str = json.dumps(schema)
-        else:
-            schema_str = schema
+        # Registration is idempotent; skip the POST if we already hold the ID
+        entry = self._schema_cache.get(subject)
+        if entry is not None and entry[0].schema == schema_str:
+            return entry[0].schema_id
         
+        await self._ensure_session()
         url = f"{self.url}/subjects/{subject}/versions"
-        payload = {"schema": schema_str}
+        body = orjson.dumps({"schema": schema_str})
         
         try:
-            async with self._session.post(url, json=payload) as response:
+            async with self._session.post(
+                url,
+                data=body,
+                **self._post_kwargs
+            ) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
                     schema_id = data["id"]
+                    self._id_cache[schema_id] = schema_str
+                    self._neg_cache.pop(subject, None)
+                    self._neg_cache.pop(schema_id, None)
+                    
+                    version = data.get("version")
+                    if version is None:
+                        # Older registries omit the version from the POST response
+                        latest = await self._single_flight(
+                            self._inflight_subject, subject, self._fetch_latest
+                        )
+                        version = latest.version
                     
                     # Cache the schema
-                    self._schema_cache[subject] = SchemaMetadata(
+                    self._cache_latest(SchemaMetadata(
                         schema_id=schema_id,
                         schema=schema_str,
                         subject=subject,
-                        version=data.get("version", -1)
-                    )
-                    self._id_cache[schema_id] = schema_str
+                        version=version
+                    ))
                     
                     logger.info(f"Registered schema for subject '{subject}': ID {schema_id}")
                     return schema_id
@@ -125,6 +229,39 @@ class SchemaRegistryClient:
             logger.error(f"Error registering schema: {e}")
             raise
     
+    async def _canonicalize(self, schema: str | dict) -> str:
+        """
+        Serialize a schema to its canonical JSON string.
+        
+        Dict schemas are serialized with sorted keys and compact separators,
+        memoized per dict object. Large schemas are serialized off the event
+        loop. Strings are passed through unchanged.
+        
+        Args:
+            schema: Avro schema as JSON string or dict
+            
+        Returns:
+            Schema as JSON string
+        """
+        if not isinstance(schema, dict):
+            return schema
+        
+        cached = self._canon_cache.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        
+        if len(schema.get("fields", ())) >= LARGE_SCHEMA_FIELDS:
+            encoded = await asyncio.to_thread(
+                orjson.dumps, schema, option=orjson.OPT_SORT_KEYS
+            )
+        else:
+            encoded = orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)
+        schema_str = encoded.decode()
+        if len(self._canon_cache) >= 128:
+            self._canon_cache.clear()
+        self._canon_cache[id(schema)] = (schema, schema_str)
+        return schema_str
+    
     async def get_schema_by_id(self, schema_id: int) -> str:
         """
         Get schema by ID from registry.
@@ -138,18 +275,67 @@ class SchemaRegistryClient:
         # Check cache first
         if schema_id in self._id_cache:
             return self._id_cache[schema_id]
+        self._check_negative(schema_id)
+        
+        return await self._single_flight(
+            self._inflight_id, schema_id, self._fetch_id
+        )
+    
+    async def get_schemas_by_ids(self, schema_ids: list[int]) -> dict[int, str]:
+        """
+        Get several schemas by ID, fetching all cache misses concurrently.
+        
+        Args:
+            schema_ids: Schema IDs (duplicates are fetched once)
+            
+        Returns:
+            Mapping of schema ID to schema JSON string
+            
+        Raises:
+            Exception: The first fetch failure, after all fetches finished
+        """
+        schemas: dict[int, str] = {}
+        misses: list[int] = []
+        for schema_id in dict.fromkeys(schema_ids):
+            if schema_id in self._id_cache:
+                schemas[schema_id] = self._id_cache[schema_id]
+            else:
+                self._check_negative(schema_id)
+                misses.append(schema_id)
+        
+        if not misses:
+            return schemas
         
+        tasks = [
+            asyncio.create_task(
+                self._single_flight(self._inflight_id, schema_id, self._fetch_id)
+            )
+            for schema_id in misses
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            raise errors[0]
+        
+        schemas.update(zip(misses, results))
+        return schemas
+    
+    async def _fetch_id(self, schema_id: int) -> str:
+        """Fetch a schema by ID from the registry and cache it."""
         await self._ensure_session()
         url = f"{self.url}/schemas/ids/{schema_id}"
         
         try:
-            async with self._session.get(url) as response:
+            async with self._session.get(url, **self._request_kwargs) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
                     schema = data["schema"]
                     self._id_cache[schema_id] = schema
                     return schema
                 else:
+                    if response.status == 404:
+                        self._neg_cache[schema_id] = True
                     error_msg = await response.text()
                     raise Exception(f"Failed to get schema: {error_msg}")
         
@@ -168,25 +354,67 @@ class SchemaRegistryClient:
             SchemaMetadata with latest schema information
         """
         # Check cache first
-        if subject in self._schema_cache:
-            return self._schema_cache[subject]
+        entry = self._schema_cache.get(subject)
+        if entry is not None:
+            metadata, expires_at = entry
+            now = time.monotonic()
+            if now < expires_at - self.refresh_window:
+                return metadata
+            if now < expires_at:
+                # Serve the cached entry while revalidating in the background
+                if subject not in self._inflight_subject:
+                    task = asyncio.create_task(self._refresh_latest(subject))
+                    self._refresh_tasks.add(task)
+                    task.add_done_callback(self._refresh_tasks.discard)
+                return metadata
+        self._check_negative(subject)
         
+        return await self._single_flight(
+            self._inflight_subject, subject, self._fetch_latest
+        )
+    
+    def _check_negative(self, key: int | str) -> None:
+        """Raise if the registry recently answered 404 for this ID or subject."""
+        if key in self._neg_cache:
+            raise Exception(f"Schema not found (cached 404): {key}")
+    
+    async def _refresh_latest(self, subject: str) -> None:
+        """Refresh a cached latest-schema entry, logging instead of raising."""
+        try:
+            await self._single_flight(
+                self._inflight_subject, subject, self._fetch_latest
+            )
+        except Exception as e:
+            logger.warning(f"Background refresh failed for subject '{subject}': {e}")
+    
+    def _cache_latest(self, metadata: SchemaMetadata) -> None:
+        """Cache metadata as the latest schema for its subject."""
+        self._schema_cache[metadata.subject] = (
+            metadata, time.monotonic() + self.ttl
+        )
+    
+    async def _fetch_latest(self, subject: str) -> SchemaMetadata:
+        """Fetch the latest schema for a subject and cache it."""
         await self._ensure_session()
         url = f"{self.url}/subjects/{subject}/versions/latest"
         
         try:
-            async with self._session.get(url) as response:
+            async with self._session.get(url, **self._request_kwargs) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
                     metadata = SchemaMetadata(
                         schema_id=data["id"],
                         schema=data["schema"],
                         subject=subject,
                         version=data["version"]
                     )
-                    self._schema_cache[subject] = metadata
+                    self._cache_latest(metadata)
                     return metadata
                 else:
+                    # Don't keep serving an entry the registry now rejects
+                    self._schema_cache.pop(subject, None)
+                    if response.status == 404:
+                        self._neg_cache[subject] = True
                     error_msg = await response.text()
                     raise Exception(f"Failed to get latest schema: {error_msg}")
         
@@ -194,6 +422,51 @@ class SchemaRegistryClient:
             logger.error(f"Error getting latest schema: {e}")
             raise
     
+    async def _single_flight(
+        self,
+        inflight: dict[Any, asyncio.Future],
+        key: Hashable,
+        fetch: Callable[[Any], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run at most one fetch per key; concurrent callers share its result.
+        
+        If the caller running the fetch is cancelled, its waiters are not:
+        the next one to wake takes over the fetch.
+        
+        Args:
+            inflight: Map of in-flight futures for this kind of lookup
+            key: Lookup key (schema ID or subject)
+            fetch: Coroutine function performing the actual request
+            
+        Returns:
+            Result of the shared fetch
+        """
+        while (future := inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(future)
+            except _FetchAbandoned:
+                continue
+        
+        future = asyncio.get_running_loop().create_future()
+        inflight[key] = future
+        try:
+            result = await fetch(key)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                # Only this caller was cancelled; waiters retry the fetch
+                future.set_exception(_FetchAbandoned())
+            else:
+                future.set_exception(e)
+            # Mark retrieved so a fetch nobody else waited on doesn't warn
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del inflight[key]
+    
     async def get_schema_version(
         self,
         subject: str,
@@ -213,9 +486,9 @@ class SchemaRegistryClient:
         url = f"{self.url}/subjects/{subject}/versions/{version}"
         
         try:
-            async with self._session.get(url) as response:
+            async with self._session.get(url, **self._request_kwargs) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
                     return SchemaMetadata(
                         schema_id=data["id"],
                         schema=data["schema"],
@@ -247,19 +520,18 @@ class SchemaRegistryClient:
         """
         await self._ensure_session()
         
-        if isinstance(schema, dict):
-            import json
-            schema_str = json.dumps(schema)
-        else:
-            schema_str = schema
-        
+        schema_str = await self._canonicalize(schema)
         url = f"{self.url}/compatibility/subjects/{subject}/versions/latest"
-        payload = {"schema": schema_str}
+        body = orjson.dumps({"schema": schema_str})
         
         try:
-            async with self._session.post(url, json=payload) as response:
+            async with self._session.post(
+                url,
+                data=body,
+                **self._post_kwargs
+            ) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
                     return data.get("is_compatible", False)
                 else:
                     logger.warning(f"Compatibility check failed: {response.status}")
@@ -280,9 +552,9 @@ class SchemaRegistryClient:
         url = f"{self.url}/subjects"
         
         try:
-            async with self._session.get(url) as response:
+            async with self._session.get(url, **self._request_kwargs) as response:
                 if response.status == 200:
-                    return await response.json()
+                    return orjson.loads(await response.read())
                 else:
                     error_msg = await response.text()
                     raise Exception(f"Failed to list subjects: {error_msg}")
@@ -305,9 +577,9 @@ class SchemaRegistryClient:
         url = f"{self.url}/subjects/{subject}"
         
         try:
-            async with self._session.delete(url) as response:
+            async with self._session.delete(url, **self._request_kwargs) as response:
                 if response.status == 200:
-                    versions = await response.json()
+                    versions = orjson.loads(await response.read())
                     # Clear from cache
                     self._schema_cache.pop(subject, None)
                     logger.info(f"Deleted subject '{subject}'")
@@ -320,8 +592,16 @@ class SchemaRegistryClient:
             logger.error(f"Error deleting subject: {e}")
             raise
     
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        """Size and eviction counts of the subject and schema-ID caches."""
+        return {
+            "subject": self._schema_cache.stats(),
+            "schema_id": self._id_cache.stats()
+        }
+    
     def clear_cache(self):
         """Clear the local schema cache."""
         self._schema_cache.clear()
         self._id_cache.clear()
+        self._neg_cache.clear()
         logger.info("Schema cache cleared")
@@ -1,35 +1,136 @@
-import requests
+import asyncio
+import aiohttp
+import orjson
 from typing import Optional, Dict, Any
 
 
-class HttpUtil:
-    def __init__(self, default_timeout: int = 5):
+_DEFAULT_CONNECTOR: Optional[aiohttp.TCPConnector] = None
+_DEFAULT_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+def _new_resolver() -> aiohttp.abc.AbstractResolver:
+    """c-ares resolver when aiodns is available, else the threaded default."""
+    try:
+        return aiohttp.AsyncResolver()
+    except RuntimeError:
+        return aiohttp.ThreadedResolver()
+
+
+def create_connector() -> aiohttp.TCPConnector:
+    """
+    Build the pooled connector used by the HTTP clients.
+
+    DNS is resolved asynchronously through aiodns, so a cold lookup
+    doesn't tie up a thread from the default executor.
+    """
+    return aiohttp.TCPConnector(
+        resolver=_new_resolver(),
+        limit=64,
+        limit_per_host=16,
+        keepalive_timeout=60,
+        enable_cleanup_closed=True,
+        ttl_dns_cache=300
+    )
+
+
+def _json_serialize(obj: Any) -> str:
+    return orjson.dumps(obj).decode()
+
+
+def create_session(connector: Optional[aiohttp.TCPConnector] = None) -> aiohttp.ClientSession:
+    """
+    Build a client session whose json= request bodies are encoded by orjson.
+
+    Args:
+        connector: Connector to use; a new pooled one when omitted
+    """
+    return aiohttp.ClientSession(
+        connector=connector or create_connector(),
+        json_serialize=_json_serialize
+    )
+
+
+async def get_default_session() -> aiohttp.ClientSession:
+    """
+    Return the process-wide session, creating it on first use.
+
+    Clients that don't own a session share this one so DNS lookups and
+    TLS handshakes are paid once per host instead of once per client.
+    Per-client settings (timeout, auth, headers) must be passed per request.
+    """
+    global _DEFAULT_CONNECTOR, _DEFAULT_SESSION
+    if _DEFAULT_SESSION is None or _DEFAULT_SESSION.closed:
+        _DEFAULT_CONNECTOR = create_connector()
+        _DEFAULT_SESSION = create_session(_DEFAULT_CONNECTOR)
+    return _DEFAULT_SESSION
+
+
+async def close_default_session() -> None:
+    """Close the process-wide session; call once at application shutdown."""
+    global _DEFAULT_CONNECTOR, _DEFAULT_SESSION
+    if _DEFAULT_SESSION is not None and not _DEFAULT_SESSION.closed:
+        await _DEFAULT_SESSION.close()
+    _DEFAULT_SESSION = None
+    _DEFAULT_CONNECTOR = None
+
+
+class AsyncHttpUtil:
+    def __init__(
+        self,
+        default_timeout: int = 5,
+        max_concurrency: int = 32,
+        own_session: bool = False
+    ):
         self.default_timeout = default_timeout
+        self._own_session = own_session
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __aenter__(self):
+        await self._ensure_session()
+        return self
 
-    def get(
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, or create a private one if owned."""
+        if not self._own_session:
+            return await get_default_session()
+        if self._session is None or self._session.closed:
+            self._session = create_session()
+        return self._session
+
+    async def close(self) -> None:
+        """Close the private session; the shared one is left open."""
+        if self._own_session and self._session and not self._session.closed:
+            await self._session.close()
+
+    async def get(
         self,
         url: str,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
         timeout: Optional[int] = None
     ) -> Dict[str, Any]:
+        session = await self._ensure_session()
+        request_kwargs: Dict[str, Any] = {
+            "params": params,
+            "headers": headers,
+            "timeout": aiohttp.ClientTimeout(total=timeout or self.default_timeout)
+        }
+
         try:
-            res = requests.get(
-                url,
-                params=params,
-                headers=headers,
-                timeout=timeout or self.default_timeout
-            )
+            async with self._semaphore:
+                async with session.get(url, **request_kwargs) as res:
+                    res.raise_for_status()
 
-            res.raise_for_status()
+                    try:
+                        data = await res.json(content_type=None)
+                    except ValueError:
+                        data = await res.text()
 
-            try:
-                return {"success": True, "data": res.json(), "status": res.status_code}
-            except ValueError:
-                return {"success": True, "data": res.text, "status": res.status_code}
+                    return {"success": True, "data": data, "status": res.status}
 
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             return {"success": False, "error": str(e)}
-
-
-http = HttpUtil()
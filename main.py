@@ -2,13 +2,30 @@ import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import Awaitable, Callable
+import uvloop
 from fastapi import FastAPI, Request
 from dotenv import load_dotenv
-from starlette.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from core.exceptions import BusinessException
-from core.listener import MemorialVectorListener, MemorialDeleteListener
-from app.feed.service import MemorialVectorStoreService, MemorialVectorDeleteService
+from core.listener import (
+    UnifiedMemorialListener,
+    MEMORIAL_VECTORIZING_TOPIC,
+    MEMORIAL_VECTOR_DELETE_TOPIC,
+)
+from app.feed.service import (
+    FeedSearchService,
+    MemorialVectorStoreService,
+    MemorialVectorDeleteService,
+)
+from core.serializer import SchemaRegistryClient
+from core.util.http_util import close_default_session
+
+# Before any event loop exists, so the app and Kafka tasks all run on uvloop
+asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 load_dotenv()
 
@@ -20,159 +37,165 @@ logger = logging.getLogger(__name__)
 
 
 
-memorial_listener: MemorialVectorListener | None = None
-memorial_delete_listener: MemorialDeleteListener | None = None
-listener_task: asyncio.Task | None = None
-delete_listener_task: asyncio.Task | None = None
-
-memorial_store_service: MemorialVectorStoreService | None = None
-memorial_delete_service: MemorialVectorDeleteService | None = None
+@dataclass
+class ServiceContext:
+    """Resources owned by one application instance, kept on app.state.ctx."""
+    schema_registry: SchemaRegistryClient | None = None
+    memorial_listener: UnifiedMemorialListener | None = None
+    listener_task: asyncio.Task | None = None
+    memorial_store_service: MemorialVectorStoreService | None = None
+    memorial_delete_service: MemorialVectorDeleteService | None = None
+    feed_search_service: FeedSearchService | None = None
 
 
-async def process_memorial_message(data: dict) -> None:
+async def process_memorial_message(ctx: ServiceContext, data: dict) -> None:
     try:
-        await memorial_store_service.process_memorial(data)
+        await ctx.memorial_store_service.process_memorial(data)
     except Exception as e:
         logger.error(f"Error processing memorial message: {e}", exc_info=True)
         raise
 
 
-async def process_memorial_delete_message(data: dict) -> None:
+async def process_memorial_delete_message(ctx: ServiceContext, data: dict) -> None:
     try:
-        await memorial_delete_service.delete_memorial(data)
+        await ctx.memorial_delete_service.delete_memorial(data)
     except Exception as e:
         logger.error(f"Error processing memorial delete message: {e}", exc_info=True)
         raise
 
 
-async def start_listener() -> None:
-    global memorial_listener, listener_task
-
+async def start_listener(ctx: ServiceContext) -> None:
     try:
         bootstrap_servers = os.getenv('KAFKA_BOOTSTRAP_SERVERS', 'localhost:9092')
         schema_registry_url = os.getenv('SCHEMA_REGISTRY_URL', 'http://localhost:8081')
         group_id = os.getenv('KAFKA_CONSUMER_GROUP_ID', 'memorial-vectorizing-consumer-group')
+        # The delete topic used to have its own group; new partitions of this
+        # group resume from its offsets instead of replaying every delete
+        legacy_delete_group_id = os.getenv(
+            'KAFKA_DELETE_CONSUMER_GROUP_ID', 'memorial-vector-delete-consumer-group'
+        )
+        if os.getenv('KAFKA_DELETE_CONSUMER_GROUP_ID'):
+            logger.warning(
+                f"KAFKA_DELETE_CONSUMER_GROUP_ID is deprecated: '{MEMORIAL_VECTOR_DELETE_TOPIC}' "
+                f"is now consumed in group '{group_id}'; '{legacy_delete_group_id}' "
+                "only seeds its starting offsets"
+            )
 
         logger.info(f"Initializing Memorial Kafka Listener: {bootstrap_servers}")
 
-        memorial_listener = MemorialVectorListener(
+        # One consumer serves both topics, dispatching by message topic
+        ctx.memorial_listener = UnifiedMemorialListener(
             bootstrap_servers=bootstrap_servers,
             schema_registry_url=schema_registry_url,
+            schema_registry_client=ctx.schema_registry,
+            handlers={
+                MEMORIAL_VECTORIZING_TOPIC: partial(process_memorial_message, ctx),
+                MEMORIAL_VECTOR_DELETE_TOPIC: partial(process_memorial_delete_message, ctx),
+            },
             group_id=group_id,
             auto_offset_reset='earliest',
-            enable_auto_commit=True
+            # Offsets are committed per batch once its handlers finished
+            enable_auto_commit=False,
+            dlq_topic=os.getenv('KAFKA_DLQ_TOPIC', 'memorial-vectorizing-dlq'),
+            offset_seed_groups={MEMORIAL_VECTOR_DELETE_TOPIC: legacy_delete_group_id}
         )
 
-        memorial_listener.set_message_handler(process_memorial_message)
+        await ctx.memorial_listener.start()
 
-        await memorial_listener.start()
-
-        logger.info("Starting to consume memorial vectorizing requests")
-        await memorial_listener.consume()
+        logger.info("Starting to consume memorial vectorizing and delete requests")
+        await ctx.memorial_listener.consume()
 
     except asyncio.CancelledError:
         logger.info("Listener task cancelled")
         raise
     except Exception as e:
         logger.error(f"Error in listener: {e}", exc_info=True)
+        # Release the consumer so a restart can rejoin the group cleanly
+        if ctx.memorial_listener:
+            await ctx.memorial_listener.close()
+            ctx.memorial_listener = None
         raise
 
 
-async def start_delete_listener() -> None:
-    global memorial_delete_listener, delete_listener_task
-
-    try:
-        bootstrap_servers = os.getenv('KAFKA_BOOTSTRAP_SERVERS', 'localhost:9092')
-        schema_registry_url = os.getenv('SCHEMA_REGISTRY_URL', 'http://localhost:8081')
-        group_id = os.getenv('KAFKA_DELETE_CONSUMER_GROUP_ID', 'memorial-vector-delete-consumer-group')
-
-        logger.info(f"Initializing Memorial Delete Kafka Listener: {bootstrap_servers}")
-
-        memorial_delete_listener = MemorialDeleteListener(
-            bootstrap_servers=bootstrap_servers,
-            schema_registry_url=schema_registry_url,
-            group_id=group_id,
-            auto_offset_reset='earliest',
-            enable_auto_commit=True
-        )
-
-        memorial_delete_listener.set_message_handler(process_memorial_delete_message)
-
-        await memorial_delete_listener.start()
-
-        logger.info("Starting to consume memorial vector delete requests")
-        await memorial_delete_listener.consume()
-
-    except asyncio.CancelledError:
-        logger.info("Delete listener task cancelled")
-        raise
-    except Exception as e:
-        logger.error(f"Error in delete listener: {e}", exc_info=True)
-        raise
-
-
-async def stop_listener() -> None:
-    global memorial_listener, listener_task
-
-    if listener_task:
-        logger.info("Stopping listener task")
-        listener_task.cancel()
+async def supervise(
+    coro_factory: Callable[[], Awaitable[None]],
+    name: str,
+    initial_backoff: float = 0.5,
+    max_backoff: float = 30.0
+) -> None:
+    """
+    Run a long-lived coroutine, restarting it with exponential backoff
+    whenever it fails. Cancellation stops the supervisor.
+    """
+    loop = asyncio.get_running_loop()
+    backoff = initial_backoff
+    while True:
+        started_at = loop.time()
         try:
-            await listener_task
+            await coro_factory()
+            logger.warning(f"{name} exited; restarting")
         except asyncio.CancelledError:
-            pass
-
-    if memorial_listener:
-        logger.info("Closing memorial listener")
-        await memorial_listener.close()
-        memorial_listener = None
-
-
-async def stop_delete_listener() -> None:
-    global memorial_delete_listener, delete_listener_task
-
-    if delete_listener_task:
-        logger.info("Stopping delete listener task")
-        delete_listener_task.cancel()
+            raise
+        except Exception as e:
+            logger.warning(f"{name} failed ({e}); restarting in {backoff:.1f}s")
+        # A run that stayed up longer than the cap starts the backoff over
+        if loop.time() - started_at > max_backoff:
+            backoff = initial_backoff
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, max_backoff)
+
+
+async def stop_listener(ctx: ServiceContext) -> None:
+    if ctx.listener_task:
+        logger.info("Stopping listener task")
+        ctx.listener_task.cancel()
         try:
-            await delete_listener_task
+            await ctx.listener_task
         except asyncio.CancelledError:
             pass
+        ctx.listener_task = None
 
-    if memorial_delete_listener:
-        logger.info("Closing memorial delete listener")
-        await memorial_delete_listener.close()
-        memorial_delete_listener = None
+    if ctx.memorial_listener:
+        logger.info("Closing memorial listener")
+        await ctx.memorial_listener.close()
+        ctx.memorial_listener = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global listener_task, delete_listener_task, memorial_store_service, memorial_delete_service
+    ctx = ServiceContext()
+    app.state.ctx = ctx
 
     logger.info("Starting Feed Service")
 
     try:
+        # One registry client (and schema cache) for the listener and publishers
+        ctx.schema_registry = SchemaRegistryClient(
+            url=os.getenv('SCHEMA_REGISTRY_URL', 'http://localhost:8081')
+        )
+
         # Initialize services
-        memorial_store_service = MemorialVectorStoreService()
+        ctx.memorial_store_service = MemorialVectorStoreService()
         logger.info("Memorial Vector Store Service initialized")
 
-        memorial_delete_service = MemorialVectorDeleteService()
+        ctx.memorial_delete_service = MemorialVectorDeleteService()
         logger.info("Memorial Vector Delete Service initialized")
 
+        ctx.feed_search_service = FeedSearchService()
+
         # Initialize publishers
-        await memorial_store_service.initialize_publisher()
+        await ctx.memorial_store_service.initialize_publisher(ctx.schema_registry)
         logger.info("Store service publisher initialized")
 
-        await memorial_delete_service.initialize_publisher()
+        await ctx.memorial_delete_service.initialize_publisher(ctx.schema_registry)
         logger.info("Delete service publisher initialized")
 
-        # Start listeners
-        listener_task = asyncio.create_task(start_listener())
+        # Start listener
+        ctx.listener_task = asyncio.create_task(
+            supervise(partial(start_listener, ctx), "Kafka listener")
+        )
         logger.info("Kafka listener started")
 
-        delete_listener_task = asyncio.create_task(start_delete_listener())
-        logger.info("Kafka delete listener started")
-
     except Exception as e:
         logger.error(f"Error during startup: {e}", exc_info=True)
         raise
@@ -182,22 +205,30 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Feed Service")
 
-    await stop_listener()
-    await stop_delete_listener()
-    
-    # Close publishers
-    if memorial_store_service:
-        await memorial_store_service.close_publisher()
-        logger.info("Store service publisher closed")
-    
-    if memorial_delete_service:
-        await memorial_delete_service.close_publisher()
-        logger.info("Delete service publisher closed")
+    await stop_listener(ctx)
+
+    # Close services (publishers and vector store clients)
+    if ctx.memorial_store_service:
+        await ctx.memorial_store_service.close()
+        logger.info("Store service closed")
+
+    if ctx.memorial_delete_service:
+        await ctx.memorial_delete_service.close()
+        logger.info("Delete service closed")
+
+    if ctx.feed_search_service:
+        await ctx.feed_search_service.close()
+
+    if ctx.schema_registry:
+        await ctx.schema_registry.close()
+
+    await close_default_session()
 app = FastAPI(
     title="Feed Service",
     description="Memorial vectorizing service with Kafka integration",
     version="0.1.1",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 @app.exception_handler(Exception)
@@ -205,7 +236,7 @@ async def global_exception_handler(request : Request, exc: Exception):
     if isinstance(exc, BusinessException):
         print("error:", exc.message)
         print("status code:", exc.status_code)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             content={
                 "message": exc.message,
@@ -213,7 +244,7 @@ async def global_exception_handler(request : Request, exc: Exception):
             },
         )
     print("error:", str(exc))
-    return JSONResponse(status_code=500, content={
+    return ORJSONResponse(status_code=500, content={
                 "message": str(exc),
                 "status": 500
             })
@@ -234,9 +265,10 @@ async def root():
 
 
 @app.get("/health")
-async def health():
-    listener_status = "running" if memorial_listener and memorial_listener._started else "stopped"
-    delete_listener_status = "running" if memorial_delete_listener and memorial_delete_listener._started else "stopped"
+async def health(request: Request):
+    # Both topics are served by the same consumer
+    listener = request.app.state.ctx.memorial_listener
+    listener_status = "running" if listener and listener._started else "stopped"
 
     return {
         "status": "healthy",
@@ -244,12 +276,12 @@ async def health():
             {
                 "name": "memorial-vectorizing",
                 "status": listener_status,
-                "topic": "memorial-vectorizing-request"
+                "topic": MEMORIAL_VECTORIZING_TOPIC
             },
             {
                 "name": "memorial-vector-delete",
-                "status": delete_listener_status,
-                "topic": "memorial-vector-delete-request"
+                "status": listener_status,
+                "topic": MEMORIAL_VECTOR_DELETE_TOPIC
             }
         ]
     }
@@ -262,5 +294,8 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=os.getenv("UVICORN_RELOAD", "0") == "1",
+        workers=int(os.getenv("UVICORN_WORKERS", "1")),
+        loop="uvloop",
+        http="httptools",
     )
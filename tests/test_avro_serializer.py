@@ -0,0 +1,222 @@
+import asyncio
+import datetime
+import io
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import avro.io
+import avro.schema
+
+from core.serializer import AvroDeserializer, AvroSerializer
+from core.serializer.avro_decoder import compile_decoder
+
+
+SCHEMA = {
+    "type": "record",
+    "name": "Memorial",
+    "fields": [
+        {"name": "memorialId", "type": "long"},
+        {"name": "content", "type": "string"},
+    ],
+}
+
+
+class FakeSchemaRegistry:
+    """Serves SCHEMA under ID 1 and counts lookups."""
+
+    def __init__(self):
+        self.lookups = 0
+
+    async def register_schema(self, subject, schema):
+        return 1
+
+    async def get_schema_by_id(self, schema_id):
+        self.lookups += 1
+        return json.dumps(SCHEMA)
+
+
+class PreparedDecodeTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.registry = FakeSchemaRegistry()
+        serializer = AvroSerializer(self.registry, "memorial-value", SCHEMA)
+        self.message = {"memorialId": 7, "content": "hello"}
+        self.data = await serializer.serialize(self.message)
+        self.deserializer = AvroDeserializer(self.registry)
+
+    async def test_worker_decodes_with_reader_from_prepare(self):
+        reader = await self.deserializer.prepare(self.data)
+
+        def decode_without_cache():
+            # Worker threads must not reach the reader cache
+            self.deserializer._reader_cache = None
+            return self.deserializer.deserialize_sync(self.data, reader)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            result = await asyncio.get_running_loop().run_in_executor(
+                pool, decode_without_cache
+            )
+
+        self.assertEqual(result, self.message)
+        self.assertEqual(self.registry.lookups, 1)
+
+    async def test_async_paths_agree(self):
+        self.assertEqual(await self.deserializer.deserialize(self.data), self.message)
+        self.assertEqual(
+            await self.deserializer.deserialize_async(self.data), self.message
+        )
+        self.assertEqual(self.registry.lookups, 1)
+
+    async def test_empty_message_has_no_reader(self):
+        self.assertIsNone(await self.deserializer.prepare(b""))
+
+
+
+PARITY_SCHEMA = {
+    "type": "record",
+    "name": "Outer",
+    "fields": [
+        {"name": "id", "type": "long"},
+        {"name": "small", "type": "int"},
+        {"name": "ok", "type": "boolean"},
+        {"name": "ratio", "type": "float"},
+        {"name": "score", "type": "double"},
+        {"name": "raw", "type": "bytes"},
+        {"name": "note", "type": ["null", "string"]},
+        {"name": "any", "type": ["null", "string", "long", "double", {
+            "type": "record", "name": "Tag", "fields": [{"name": "label", "type": "string"}]
+        }]},
+        {"name": "kind", "type": {"type": "enum", "name": "Kind", "symbols": ["A", "B", "C"]}},
+        {"name": "digest", "type": {"type": "fixed", "name": "Digest", "size": 4}},
+        {"name": "tags", "type": {"type": "array", "items": "Tag"}},
+        {"name": "counts", "type": {"type": "map", "values": "long"}},
+        {"name": "grid", "type": {"type": "array", "items": {"type": "array", "items": ["null", "int"]}}},
+        {"name": "inner", "type": {
+            "type": "record", "name": "Inner", "fields": [
+                {"name": "tag", "type": "Tag"},
+                {"name": "labels", "type": {"type": "map", "values": ["null", "Tag"]}},
+            ]
+        }},
+    ],
+}
+
+PARITY_DATA = [
+    {
+        "id": 1 << 40, "small": -7, "ok": True, "ratio": 0.5, "score": -1.25,
+        "raw": b"\x00\xff", "note": None, "any": None, "kind": "A",
+        "digest": b"abcd", "tags": [], "counts": {}, "grid": [],
+        "inner": {"tag": {"label": ""}, "labels": {}},
+    },
+    {
+        "id": -(1 << 62), "small": 2 ** 31 - 1, "ok": False, "ratio": -3.0,
+        "score": 1e300, "raw": b"", "note": "메모", "any": "text", "kind": "C",
+        "digest": b"\x00\x01\x02\x03", "tags": [{"label": "a"}, {"label": "b"}],
+        "counts": {"x": 1, "y": -2}, "grid": [[1, None], [], [3]],
+        "inner": {"tag": {"label": "t"}, "labels": {"k": None, "v": {"label": "w"}}},
+    },
+    {
+        "id": 0, "small": 0, "ok": True, "ratio": 0.0, "score": 0.0, "raw": b"x",
+        "note": "n", "any": 42, "kind": "B", "digest": b"zzzz",
+        "tags": [{"label": "only"}], "counts": {"": 0}, "grid": [[None]],
+        "inner": {"tag": {"label": "t"}, "labels": {}},
+    },
+    {
+        "id": 5, "small": 5, "ok": False, "ratio": 1.5, "score": 2.5, "raw": b"",
+        "note": None, "any": 0.25, "kind": "A", "digest": b"abcd", "tags": [],
+        "counts": {}, "grid": [], "inner": {"tag": {"label": ""}, "labels": {}},
+    },
+    {
+        "id": 6, "small": 6, "ok": True, "ratio": 1.0, "score": 1.0, "raw": b"",
+        "note": None, "any": {"label": "in-union"}, "kind": "B", "digest": b"abcd",
+        "tags": [], "counts": {}, "grid": [],
+        "inner": {"tag": {"label": ""}, "labels": {}},
+    },
+]
+
+
+def _zigzag(n: int) -> bytes:
+    """Avro varint encoding of a long, for hand-built payloads."""
+    n = (n << 1) ^ (n >> 63)
+    out = bytearray()
+    while n & ~0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _write(schema: avro.schema.Schema, datum) -> bytes:
+    buf = io.BytesIO()
+    avro.io.DatumWriter(schema).write(datum, avro.io.BinaryEncoder(buf))
+    return buf.getvalue()
+
+
+def _read(schema: avro.schema.Schema, data: bytes):
+    return avro.io.DatumReader(schema).read(avro.io.BinaryDecoder(io.BytesIO(data)))
+
+
+class CompiledDecoderParityTest(unittest.TestCase):
+    def assert_parity(self, schema: avro.schema.Schema, data: bytes):
+        decode = compile_decoder(schema)
+        self.assertIsNotNone(decode)
+        self.assertEqual(decode(data, 0), _read(schema, data))
+
+    def test_matches_datum_reader(self):
+        schema = avro.schema.parse(json.dumps(PARITY_SCHEMA))
+        for datum in PARITY_DATA:
+            with self.subTest(any=datum["any"]):
+                self.assert_parity(schema, _write(schema, datum))
+
+    def test_negative_block_counts_with_byte_sizes(self):
+        # Writers may prefix a block with -count and its size in bytes
+        array_items = _zigzag(1) + _zigzag(-2) + _zigzag(300)
+        array_schema = avro.schema.parse('{"type": "array", "items": "long"}')
+        self.assert_parity(
+            array_schema,
+            _zigzag(-3) + _zigzag(len(array_items)) + array_items
+            + _zigzag(1) + _zigzag(7) + _zigzag(0)
+        )
+
+        map_items = _zigzag(1) + b"a" + _zigzag(1) + _zigzag(2) + b"bc" + _zigzag(-5)
+        map_schema = avro.schema.parse('{"type": "map", "values": "long"}')
+        self.assert_parity(
+            map_schema,
+            _zigzag(-2) + _zigzag(len(map_items)) + map_items + _zigzag(0)
+        )
+
+    def test_unsupported_schemas_fall_back_to_datum_reader(self):
+        schemas = {
+            "logical": {
+                "type": "record", "name": "Stamped", "fields": [
+                    {"name": "at", "type": {"type": "long", "logicalType": "timestamp-millis"}},
+                ],
+            },
+            "recursive": {
+                "type": "record", "name": "Node", "fields": [
+                    {"name": "value", "type": "long"},
+                    {"name": "next", "type": ["null", "Node"]},
+                ],
+            },
+        }
+        data = {
+            "logical": {"at": datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc)},
+            "recursive": {"value": 1, "next": {"value": 2, "next": None}},
+        }
+        deserializer = AvroDeserializer(FakeSchemaRegistry())
+
+        for schema_id, name in enumerate(schemas, start=2):
+            with self.subTest(name):
+                schema_str = json.dumps(schemas[name])
+                schema = avro.schema.parse(schema_str)
+                self.assertIsNone(compile_decoder(schema))
+
+                payload = _write(schema, data[name])
+                message = b"\x00" + schema_id.to_bytes(4, "big") + payload
+                entry = deserializer._build_reader(schema_id, schema_str)
+                self.assertEqual(
+                    deserializer._read_payload(entry, message), data[name]
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
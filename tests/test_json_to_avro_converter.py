@@ -0,0 +1,50 @@
+import copy
+import unittest
+from unittest import mock
+
+from core.serializer import JsonToAvroConverter
+
+
+SCHEMA = {
+    "type": "record",
+    "name": "Flagged",
+    "fields": [
+        {"name": "flag", "type": "boolean"},
+        {"name": "name", "type": "string"},
+    ],
+}
+
+
+class CoercionTest(unittest.TestCase):
+    def setUp(self):
+        # Compiled plans are cached per schema object; a fresh copy makes
+        # each test compile, so the fallback is observable
+        self.schema = copy.deepcopy(SCHEMA)
+        self.compile_record = mock.patch.object(
+            JsonToAvroConverter, "_compile_record",
+            wraps=JsonToAvroConverter._compile_record
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def convert(self, data):
+        return JsonToAvroConverter.json_to_avro(data, self.schema)
+
+    def test_well_typed_data_takes_fast_path(self):
+        result = self.convert({"flag": False, "name": "x"})
+
+        self.assertEqual(result, {"flag": False, "name": "x"})
+        self.compile_record.assert_not_called()
+
+    def test_string_bool_is_coerced_alike_on_both_paths(self):
+        # "name": 5 forces the fallback; with "name": "x" lax msgspec would
+        # have accepted the record and turned "false" into False
+        fallback = self.convert({"flag": "false", "name": 5})
+        self.compile_record.assert_called_once()
+        other = self.convert({"flag": "false", "name": "x"})
+
+        self.assertEqual(fallback, {"flag": True, "name": "5"})
+        self.assertEqual(other, {"flag": True, "name": "x"})
+
+
+if __name__ == "__main__":
+    unittest.main()
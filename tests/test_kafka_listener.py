@@ -0,0 +1,148 @@
+import unittest
+from unittest import mock
+
+from aiokafka import OffsetAndMetadata, TopicPartition
+
+from core.listener import (
+    UnifiedMemorialListener,
+    MEMORIAL_VECTORIZING_TOPIC,
+    MEMORIAL_VECTOR_DELETE_TOPIC,
+)
+
+
+class StubConsumer:
+    def __init__(self, committed: dict[TopicPartition, int]):
+        self._committed = committed
+        self.seeks: dict[TopicPartition, int] = {}
+        self.seeked_to_end: list[TopicPartition] = []
+
+    async def committed(self, tp):
+        return self._committed.get(tp)
+
+    def seek(self, tp, offset):
+        self.seeks[tp] = offset
+
+    async def seek_to_end(self, *partitions):
+        self.seeked_to_end.extend(partitions)
+
+
+def stub_admin(offsets=None, error=None):
+    """AIOKafkaAdminClient replacement answering with fixed group offsets."""
+    requested = []
+
+    class StubAdmin:
+        def __init__(self, **kwargs):
+            pass
+
+        async def start(self):
+            if error:
+                raise error
+
+        async def list_consumer_group_offsets(self, group_id, partitions=None):
+            requested.append((group_id, sorted(partitions)))
+            return offsets
+
+        async def close(self):
+            pass
+
+    return StubAdmin, requested
+
+
+class OffsetSeedTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.listener = UnifiedMemorialListener(
+            bootstrap_servers="localhost:9092",
+            schema_registry_url="http://localhost:8081",
+            offset_seed_groups={MEMORIAL_VECTOR_DELETE_TOPIC: "legacy-delete-group"}
+        )
+        self.new_delete = TopicPartition(MEMORIAL_VECTOR_DELETE_TOPIC, 0)
+        self.known_delete = TopicPartition(MEMORIAL_VECTOR_DELETE_TOPIC, 1)
+        self.vectorizing = TopicPartition(MEMORIAL_VECTORIZING_TOPIC, 0)
+        self.listener._consumer = StubConsumer({self.known_delete: 5})
+
+    async def test_new_partitions_start_at_seed_group_offsets(self):
+        admin, requested = stub_admin({self.new_delete: OffsetAndMetadata(42, "")})
+
+        with mock.patch("core.listener.kafka_listener.AIOKafkaAdminClient", admin):
+            await self.listener._seed_offsets(
+                {self.new_delete, self.known_delete, self.vectorizing}
+            )
+
+        self.assertEqual(requested, [("legacy-delete-group", [self.new_delete])])
+        self.assertEqual(self.listener._consumer.seeks, {self.new_delete: 42})
+
+    async def test_partitions_unknown_to_seed_group_keep_reset_policy(self):
+        admin, _ = stub_admin({self.new_delete: OffsetAndMetadata(-1, "")})
+
+        with mock.patch("core.listener.kafka_listener.AIOKafkaAdminClient", admin):
+            await self.listener._seed_offsets({self.new_delete})
+
+        self.assertEqual(self.listener._consumer.seeks, {})
+        self.assertEqual(self.listener._consumer.seeked_to_end, [])
+
+    async def test_unreadable_seed_group_starts_at_end(self):
+        admin, _ = stub_admin(error=ConnectionError("broker down"))
+
+        with mock.patch("core.listener.kafka_listener.AIOKafkaAdminClient", admin):
+            await self.listener._seed_offsets({self.new_delete})
+
+        self.assertEqual(self.listener._consumer.seeks, {})
+        self.assertEqual(self.listener._consumer.seeked_to_end, [self.new_delete])
+
+
+
+class LifecycleConsumer:
+    """AIOKafkaConsumer replacement recording start/stop."""
+
+    instances: list["LifecycleConsumer"] = []
+
+    def __init__(self, **kwargs):
+        self.running = False
+        LifecycleConsumer.instances.append(self)
+
+    def subscribe(self, topics, listener=None):
+        pass
+
+    async def start(self):
+        self.running = True
+
+    async def stop(self):
+        self.running = False
+
+
+class FailingProducer:
+    def __init__(self, **kwargs):
+        pass
+
+    async def start(self):
+        raise ConnectionError("broker down")
+
+    async def stop(self):
+        pass
+
+
+class StartFailureTest(unittest.IsolatedAsyncioTestCase):
+    async def test_consumer_is_stopped_when_dlq_producer_fails(self):
+        LifecycleConsumer.instances = []
+        listener = UnifiedMemorialListener(
+            bootstrap_servers="localhost:9092",
+            schema_registry_url="http://localhost:8081",
+            dlq_topic="memorial-vectorizing-dlq"
+        )
+        self.addAsyncCleanup(listener.close)
+
+        with mock.patch(
+            "core.listener.kafka_listener.AIOKafkaConsumer", LifecycleConsumer
+        ), mock.patch(
+            "core.listener.kafka_listener.AIOKafkaProducer", FailingProducer
+        ):
+            with self.assertRaises(ConnectionError):
+                await listener.start()
+
+        (consumer,) = LifecycleConsumer.instances
+        self.assertFalse(consumer.running)
+        self.assertFalse(listener._started)
+
+
+if __name__ == "__main__":
+    unittest.main()
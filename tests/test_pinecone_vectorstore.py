@@ -0,0 +1,224 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+from aiohttp import web
+from pinecone.exceptions import PineconeApiException
+
+from core.exceptions import VectorStoreException
+from core.vectorstores.pinecone_vectorstore import PineconeVectorStore, QUANT_SCALE_KEY
+
+
+class FakePineconeIndex:
+    """Local HTTP server answering the data-plane query and delete endpoints."""
+
+    def __init__(self, matches: list[dict]):
+        self.matches = matches
+        self.requests: list[dict] = []
+        self.deletes: list[dict] = []
+        self._runner = None
+        self.host = None
+
+    async def _query(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests.append(body)
+        return web.json_response({
+            "matches": self.matches,
+            "namespace": body.get("namespace", "")
+        })
+
+    async def _delete(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.deletes.append(body)
+        deleted = set(body.get("ids") or ())
+        self.matches = [m for m in self.matches if m["id"] not in deleted]
+        return web.json_response({})
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/query", self._query)
+        app.router.add_post("/vectors/delete", self._delete)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.host = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
+
+
+class QuantizedQueryTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = FakePineconeIndex([{
+            "id": "memorial-1",
+            "score": 0.9,
+            "values": [127.0, -64.0],
+            "metadata": {QUANT_SCALE_KEY: 0.01, "memorialId": 1}
+        }])
+        await self.server.start()
+        self.store = PineconeVectorStore(
+            api_key="test-key",
+            index_name="test-index",
+            host=self.server.host,
+            quantize=True
+        )
+
+    async def asyncTearDown(self):
+        await self.store.close()
+        await self.server.stop()
+
+    async def test_query_sends_codes_as_json_list(self):
+        result = await self.store.query([0.5, -0.25], top_k=1)
+
+        self.assertEqual(self.server.requests[0]["vector"], [127.0, -64.0])
+        self.assertEqual(result["matches"][0]["metadata"], {"memorialId": 1})
+
+    async def test_values_are_dequantized_without_requested_metadata(self):
+        result = await self.store.query(
+            [0.5, -0.25], top_k=1, include_metadata=False, include_values=True
+        )
+
+        self.assertTrue(self.server.requests[0]["includeMetadata"])
+        match = result["matches"][0]
+        self.assertNotIn("metadata", match)
+        self.assertAlmostEqual(match["values"][0], 1.27, places=5)
+        self.assertAlmostEqual(match["values"][1], -0.64, places=5)
+
+
+class QueryVectorTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = FakePineconeIndex([{"id": "memorial-1", "score": 0.9}])
+        await self.server.start()
+        self.store = PineconeVectorStore(
+            api_key="test-key",
+            index_name="test-index",
+            host=self.server.host
+        )
+
+    async def asyncTearDown(self):
+        await self.store.close()
+        await self.server.stop()
+
+    async def test_ndarray_query_vector_is_sent_as_list(self):
+        result = await self.store.query(np.array([0.5, -0.25], dtype=np.float32), top_k=1)
+
+        self.assertEqual(self.server.requests[0]["vector"], [0.5, -0.25])
+        self.assertEqual(result["matches"][0]["id"], "memorial-1")
+
+    async def test_list_query_vector_is_sent_unchanged(self):
+        await self.store.query([0.1, -0.3], top_k=1)
+
+        self.assertEqual(self.server.requests[0]["vector"], [0.1, -0.3])
+
+    async def test_cache_hits_are_isolated_from_caller_mutation(self):
+        self.server.matches[0]["metadata"] = {"tags": ["a"]}
+        first = await self.store.query([0.5, -0.25], top_k=1)
+        first["matches"][0]["metadata"]["tags"].append("b")
+        first["matches"].clear()
+
+        second = await self.store.query([0.5, -0.25], top_k=1)
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(second["matches"][0]["metadata"], {"tags": ["a"]})
+
+    async def test_write_through_another_store_invalidates_cache(self):
+        writer = PineconeVectorStore(
+            api_key="test-key",
+            index_name="test-index",
+            host=self.server.host
+        )
+        self.addAsyncCleanup(writer.close)
+
+        first = await self.store.query([0.5, -0.25], top_k=1)
+        await writer.delete("memorial-1")
+        second = await self.store.query([0.5, -0.25], top_k=1)
+
+        self.assertEqual(first["matches"][0]["id"], "memorial-1")
+        self.assertEqual(second["matches"], [])
+        self.assertEqual(len(self.server.requests), 2)
+
+
+class StubIndex:
+    """In-process index whose upsert behaviour is set per test."""
+
+    def __init__(self, upsert):
+        self.upsert = upsert
+
+    async def close(self) -> None:
+        pass
+
+
+class UpsertBatchTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.store = PineconeVectorStore(
+            api_key="test-key",
+            index_name="test-index",
+            retry_base_delay=0.01,
+            retry_max_delay=0.05
+        )
+
+    async def asyncTearDown(self):
+        await self.store.close()
+
+    async def test_failed_batch_cancels_siblings(self):
+        written = []
+
+        async def upsert(vectors, namespace):
+            if vectors[0]["id"] == "bad":
+                raise PineconeApiException(status=400)
+            await asyncio.sleep(0.2)
+            written.extend(v["id"] for v in vectors)
+
+        self.store.index = StubIndex(upsert)
+        vectors = [{"id": "bad", "values": [1.0]}] + [
+            {"id": str(i), "values": [1.0]} for i in range(5)
+        ]
+
+        with self.assertRaises(VectorStoreException):
+            await self.store.upsert_batch(vectors, batch_size=1)
+        await asyncio.sleep(0.3)
+
+        self.assertEqual(written, [])
+
+    async def test_retry_after_is_capped(self):
+        attempts = []
+
+        async def upsert(vectors, namespace):
+            attempts.append(len(vectors))
+            if len(attempts) == 1:
+                error = PineconeApiException(status=429)
+                error.headers = {"Retry-After": "3600"}
+                raise error
+
+        self.store.index = StubIndex(upsert)
+
+        await asyncio.wait_for(
+            self.store.upsert_batch([{"id": "1", "values": [1.0]}]), timeout=1
+        )
+
+        self.assertEqual(attempts, [1, 1])
+
+
+class IndexHostTest(unittest.IsolatedAsyncioTestCase):
+    async def test_host_is_resolved_once_per_index_name(self):
+        calls = []
+
+        async def describe_index(name):
+            calls.append(name)
+            return SimpleNamespace(host="http://127.0.0.1:1")
+
+        for _ in range(2):
+            store = PineconeVectorStore(api_key="test-key", index_name="host-cache-index")
+            store.pc.describe_index = describe_index
+            await store._ensure_index()
+            self.assertEqual(store.host, "http://127.0.0.1:1")
+            await store.close()
+
+        self.assertEqual(calls, ["host-cache-index"])
+
+
+if __name__ == "__main__":
+    unittest.main()
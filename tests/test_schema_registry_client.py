@@ -0,0 +1,49 @@
+import asyncio
+import unittest
+
+from core.serializer import SchemaRegistryClient
+
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = SchemaRegistryClient(url="http://127.0.0.1:1")
+        self.calls = []
+
+        async def fetch_id(schema_id):
+            self.calls.append(schema_id)
+            await asyncio.sleep(0.05)
+            return '"string"'
+
+        self.client._fetch_id = fetch_id
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_concurrent_lookups_share_one_fetch(self):
+        results = await asyncio.gather(
+            *(self.client.get_schema_by_id(1) for _ in range(5))
+        )
+
+        self.assertEqual(results, ['"string"'] * 5)
+        self.assertEqual(self.calls, [1])
+
+    async def test_waiters_survive_owner_cancellation(self):
+        owner = asyncio.create_task(self.client.get_schema_by_id(1))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(self.client.get_schema_by_id(1)) for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+
+        owner.cancel()
+        results = await asyncio.gather(*waiters)
+
+        self.assertTrue(owner.cancelled())
+        self.assertEqual(results, ['"string"'] * 3)
+        self.assertFalse(any(waiter.cancelled() for waiter in waiters))
+        # One waiter took over the fetch; the rest shared it
+        self.assertEqual(self.calls, [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()